@@ -15,28 +15,78 @@ import models
 # Blueprints
 from routes.auth import router as auth_router
 from routes.onboarding import router as onboarding_router
+from routes.schedule import router as schedule_router
+from routes.locations import router as locations_router
+from routes.documents import router as documents_router
+from routes.admin import router as admin_router
+from routes.audit import router as audit_router
+from routes.health import router as health_router
+from utils.profiling import init_profiling
+from utils.compression import init_compression
+from utils.ratelimit import init_rate_limits
+from utils.forking import init_fork_safety
+from utils.dbpool import init_db_pool, track_pool_events
+from utils.lazy import Lazy
+from services.context_service import register_cache_invalidation
+from services.audit_service import init_audit
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(ProdConfig if os.getenv("FLASK_ENV") == "production" else DevConfig)
 
     # Extensions
+    init_db_pool(app)
     db.init_app(app)
+    track_pool_events(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
     CORS(app, resources={r"/*": {"origins": "*"}})
+    init_rate_limits(app)
+    init_profiling(app)
+    init_compression(app)
+    register_cache_invalidation()
+    init_audit(app)
 
     # Blueprints
     app.register_blueprint(auth_router)
     app.register_blueprint(onboarding_router)
+    app.register_blueprint(schedule_router)
+    app.register_blueprint(locations_router)
+    app.register_blueprint(documents_router)
+    app.register_blueprint(admin_router)
+    app.register_blueprint(audit_router)
+    app.register_blueprint(health_router)
+
+    # Housekeeping sweeps on a thread; otherwise run `python worker.py` separately.
+    # Under gunicorn the thread is started per worker (post_worker_init): a
+    # thread started in a preloading master would not survive the fork.
+    if app.config["JOBS_INPROCESS"]:
+        from worker import build_scheduler
+        app.extensions["scheduler"] = build_scheduler(app)
+        if not app.config["JOBS_DEFER_START"]:
+            app.extensions["scheduler"].start()
 
     @app.get("/")
     def root():
         return jsonify({"message": "Work Scheduler Flask API is running 🚀"})
 
+    # Pre-fork: children must not reuse the parent's pooled connections
+    init_fork_safety(app)
+    if app.config["PRELOAD_WARM"]:
+        Lazy.resolve_all()
+
     return app
 
-app = create_app()
+_app = None
+
+def __getattr__(name):
+    # `app` (gunicorn "app:app", flask run) is built on first access, not at import
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
-    app.run(host="127.0.0.1", port=5000, debug=True)
+    create_app().run(host="127.0.0.1", port=5000, debug=True)
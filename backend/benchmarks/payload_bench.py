@@ -0,0 +1,95 @@
+# benchmarks/payload_bench.py
+"""
+Bytes on the wire and server time for a large shift listing.
+
+    python benchmarks/payload_bench.py [shifts] [runs]
+
+Seeds one location with `shifts` shifts (default 5000, two assignees each)
+in a throwaway SQLite file, then calls GET /schedules/<id>/shifts through
+the Flask test client for full vs. sparse field sets, with and without
+Accept-Encoding: gzip, and prints median server time and response size.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="payload-bench-"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("FLASK_ENV", "production")  # compact JSON, as served in prod
+os.environ.setdefault("AUDIT_ENABLED", "0")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from app import create_app  # noqa: E402
+from extensions import db  # noqa: E402
+from models import Employment, Location, Shift, ShiftAssignment  # noqa: E402
+
+LOCATION_ID, MANAGER_ID = 1, 1
+START = datetime(2025, 3, 1, 6, 0)
+
+CASES = [
+    ("full", None),
+    ("start,end,status", "start_time,end_time,status"),
+    ("start,end", "start_time,end_time"),
+]
+
+
+def seed(n_shifts: int) -> None:
+    tables = [t.__table__ for t in (Location, Employment, Shift, ShiftAssignment)]
+    db.metadata.create_all(db.engine, tables=tables)
+    db.session.execute(db.insert(Location), [{"loc_id": LOCATION_ID, "comp_id": 1, "loc_name": "Bench"}])
+    db.session.execute(db.insert(Employment), [{"emp_id": 1, "user_id": MANAGER_ID, "comp_id": 1,
+                                                "position": "manager", "status": "active",
+                                                "start_date": START.date()}])
+    per_day = max(1, n_shifts // 31)
+    db.session.execute(db.insert(Shift), [
+        {"shift_id": i + 1, "location_id": LOCATION_ID,
+         "start_time": START + timedelta(days=i // per_day, minutes=(i % per_day) * 5),
+         "end_time": START + timedelta(days=i // per_day, minutes=(i % per_day) * 5 + 480),
+         "status": "published" if i % 3 else "draft"}
+        for i in range(n_shifts)
+    ])
+    db.session.execute(db.insert(ShiftAssignment), [
+        {"shift_id": i + 1, "user_id": 100 + (i * 7 + k) % 400, "assigned_at": START}
+        for i in range(n_shifts) for k in (0, 1)
+    ])
+    db.session.commit()
+
+
+def main(n_shifts: int, runs: int) -> None:
+    app = create_app()
+    with app.app_context():
+        seed(n_shifts)
+        token = create_access_token(identity=str(MANAGER_ID))
+    client = app.test_client()
+    url = f"/schedules/{LOCATION_ID}/shifts?from=2025-03-01&to=2025-03-31"
+
+    print(f"{n_shifts} shifts, median of {runs} runs")
+    print(f"{'fields':<20}{'encoding':<10}{'bytes':>12}{'ms':>10}")
+    baseline = None
+    for label, fields in CASES:
+        for encoding in ("identity", "gzip"):
+            headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": encoding}
+            target = url + (f"&fields={fields}" if fields else "")
+            times, size = [], 0
+            for _ in range(runs):
+                t0 = time.perf_counter()
+                resp = client.get(target, headers=headers)
+                times.append((time.perf_counter() - t0) * 1000)
+                assert resp.status_code == 200, resp.get_data(as_text=True)
+                size = len(resp.get_data())
+            baseline = baseline or size
+            print(f"{label:<20}{encoding:<10}{size:>12,}{statistics.median(times):>10.1f}"
+                  f"   ({size / baseline:.1%} of full/identity)")
+    os.unlink(DB_PATH)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 5)
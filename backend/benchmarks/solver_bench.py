@@ -0,0 +1,91 @@
+# benchmarks/solver_bench.py
+"""
+Company solver speedup vs. worker count on a seeded synthetic company.
+
+    python benchmarks/solver_bench.py [locations] [seed]
+
+Builds the same array payloads CompanySolverService sends to the pool (no
+database needed), then times solve_all + reconcile for 1, 2, 4, ... workers
+up to os.cpu_count() and prints wall-clock speedup relative to 1 worker.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+from services.solver import MINUTES_PER_DAY, reconcile, solve_all, split_shared_hours  # noqa: E402
+
+MONDAY = 19_996 * MINUTES_PER_DAY  # a monday, in epoch minutes (epoch day 0 was a thursday)
+
+
+def make_company(n_locations: int, seed: int, staff_per_loc: int = 60,
+                 shifts_per_day: int = 120, floater_share: float = 0.1):
+    rng = np.random.default_rng(seed)
+    n_floaters = max(1, int(n_locations * staff_per_loc * floater_share / 4))
+    floaters = np.arange(10_000_000, 10_000_000 + n_floaters, dtype=np.int64)
+
+    payloads = []
+    for loc in range(n_locations):
+        local = np.arange(loc * 1000, loc * 1000 + staff_per_loc, dtype=np.int64)
+        users = np.concatenate([local, rng.choice(floaters, size=min(n_floaters, 8), replace=False)])
+
+        day = rng.integers(0, 7, shifts_per_day * 7)
+        start_tod = rng.integers(6 * 4, 18 * 4, day.size) * 15
+        starts = MONDAY + day * MINUTES_PER_DAY + start_tod
+        # Derived exactly as build_payloads does, so a wrong MONDAY can't hide here
+        dows = ((starts // MINUTES_PER_DAY) + 3) % 7
+        start_tod = starts % MINUTES_PER_DAY
+        ends = starts + rng.choice([240, 360, 480], day.size)
+
+        # Each employee is available on ~5 days, in one window per day
+        av_user = np.repeat(np.arange(users.size), 5)
+        av_dow = np.concatenate([rng.choice(7, 5, replace=False) for _ in range(users.size)])
+        av_start = rng.integers(5, 10, av_user.size) * 60
+        av_end = np.minimum(av_start + rng.integers(8, 15, av_user.size) * 60, MINUTES_PER_DAY)
+
+        payloads.append({
+            "location_id": loc,
+            "shift_ids": np.arange(loc * 100_000, loc * 100_000 + day.size, dtype=np.int64),
+            "starts": starts, "ends": ends, "dows": dows, "start_tod": start_tod,
+            "user_ids": users,
+            "av_user": av_user, "av_dow": av_dow, "av_start": av_start, "av_end": av_end,
+            "busy_user": np.empty(0, np.int64), "busy_start": np.empty(0, np.int64), "busy_end": np.empty(0, np.int64),
+            "max_minutes": 40 * 60, "alternatives": 3,
+        })
+    return payloads
+
+
+def main(n_locations: int, seed: int) -> None:
+    payloads = make_company(n_locations, seed)
+    split_shared_hours(payloads)
+    n_shifts = sum(p["shift_ids"].size for p in payloads)
+    cores = os.cpu_count() or 1
+    print(f"locations={n_locations} open_shifts={n_shifts} seed={seed} cpu_count={cores}")
+
+    counts, w = [], 1
+    while w < cores:
+        counts.append(w)
+        w *= 2
+    counts.append(cores)
+
+    base = None
+    for workers in counts:
+        t0 = time.perf_counter()
+        results = solve_all(payloads, workers=workers, mp_context="spawn")
+        t1 = time.perf_counter()
+        assignments, unfilled, reassigned = reconcile(results, {}, 40 * 60)
+        t2 = time.perf_counter()
+        wall = t2 - t0
+        base = base or wall
+        print(f"workers={workers:>3} solve={t1 - t0:7.2f}s reconcile={t2 - t1:6.2f}s wall={wall:7.2f}s "
+              f"speedup={base / wall:5.2f}x assigned={len(assignments)} unfilled={len(unfilled)} "
+              f"reassigned={reassigned}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 120,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 42)
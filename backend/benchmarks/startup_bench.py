@@ -0,0 +1,51 @@
+# benchmarks/startup_bench.py
+"""
+Cold-start benchmark: time to import the app module and to build the app,
+each in a fresh interpreter, and fail if the median exceeds the budget.
+
+    python benchmarks/startup_bench.py [runs]
+
+STARTUP_BUDGET_MS (default 1500) bounds import + create_app. No database
+connection is made; create_app must not touch the DB.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+flask_app = app.create_app()
+t2 = time.perf_counter()
+from utils.lazy import Lazy
+Lazy.resolve_all()
+t3 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "create_ms": (t2 - t1) * 1000, "warm_ms": (t3 - t2) * 1000}))
+"""
+
+
+def run_once() -> dict:
+    env = dict(os.environ, JOBS_INPROCESS="0", PRELOAD_WARM="0")
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=BACKEND, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(runs: int) -> None:
+    samples = [run_once() for _ in range(runs)]
+    med = {k: statistics.median(s[k] for s in samples) for k in samples[0]}
+    startup = med["import_ms"] + med["create_ms"]
+    print(f"runs={runs} import={med['import_ms']:.1f}ms create_app={med['create_ms']:.1f}ms "
+          f"lazy warm-up={med['warm_ms']:.1f}ms startup={startup:.1f}ms budget={BUDGET_MS:.0f}ms")
+    assert startup <= BUDGET_MS, f"startup {startup:.1f}ms exceeds budget {BUDGET_MS:.0f}ms"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
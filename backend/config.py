@@ -10,11 +10,110 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JSON_SORT_KEYS = False
 
+    # Connection pool (per worker process; total = workers x (size + overflow)).
+    # DB_POOL_MODE=pgbouncer when DATABASE_URL points at PgBouncer in transaction mode.
+    DB_POOL_MODE = os.getenv("DB_POOL_MODE", "direct")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))  # opened at worker start
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+    DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
     # JWT
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-change-me")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=int(os.getenv("JWT_ACCESS_TOKEN_EXPIRES", "3600")))
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(seconds=int(os.getenv("JWT_REFRESH_TOKEN_EXPIRES", "2592000")))
 
+    # Onboarding
+    INVITE_TTL_DAYS = int(os.getenv("INVITE_TTL_DAYS", "7"))
+
+    # Background jobs (housekeeping sweeps). Run in-process, or separately via `python worker.py`.
+    JOBS_INPROCESS = os.getenv("JOBS_INPROCESS", "0") == "1"
+    JOBS_DEFER_START = os.getenv("JOBS_DEFER_START", "0") == "1"  # set by gunicorn.conf.py
+    HOUSEKEEPING_INTERVAL_SECONDS = int(os.getenv("HOUSEKEEPING_INTERVAL_SECONDS", "300"))
+    HOUSEKEEPING_BATCH_SIZE = int(os.getenv("HOUSEKEEPING_BATCH_SIZE", "500"))
+    DRAFT_RETENTION_DAYS = int(os.getenv("DRAFT_RETENTION_DAYS", "30"))
+
+    # Demand forecasting
+    DEMAND_DEFAULT_WEEKS = int(os.getenv("DEMAND_DEFAULT_WEEKS", "8"))
+    DEMAND_MAX_WEEKS = int(os.getenv("DEMAND_MAX_WEEKS", "156"))
+    DEMAND_BATCH_LOCATIONS = int(os.getenv("DEMAND_BATCH_LOCATIONS", "50"))
+
+    # Document storage
+    DOCUMENT_STORAGE_BACKEND = os.getenv("DOCUMENT_STORAGE_BACKEND", "local")
+    DOCUMENT_STORAGE_PATH = os.getenv("DOCUMENT_STORAGE_PATH", os.path.join(os.path.dirname(__file__), "storage"))
+    DOCUMENT_MAX_BYTES = int(os.getenv("DOCUMENT_MAX_BYTES", str(25 * 1024 * 1024)))
+    # One chunk per object by default: fixed-size chunks only dedupe identical files
+    # anyway, and a single chunk file lets every full/tail-range download use sendfile.
+    # Smaller chunks trade that for partial dedup of files sharing a prefix.
+    DOCUMENT_CHUNK_SIZE = int(os.getenv("DOCUMENT_CHUNK_SIZE", str(DOCUMENT_MAX_BYTES)))
+
+    # Idempotency-Key support for write endpoints
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+    IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+
+    # Request profiling (off unless a token or a sample rate is set)
+    PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")  # send as X-Profile header to profile one request
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(__file__), "profiles"))
+    PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+    # Rate limiting / load shedding
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory | sqlite (shared by workers on a host)
+    RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", os.path.join(os.path.dirname(__file__), "ratelimit.db"))
+    # endpoint -> {"ip": (tokens/sec, burst), "tenant": (tokens/sec, burst)}; tenant = company.
+    # "failed_login" is per account and spent only by failed logins.
+    RATE_LIMIT_RULES = {
+        "auth.login":               {"ip": (1.0, 20), "failed_login": (0.05, 10)},
+        "auth.register":            {"ip": (0.2, 5)},
+        "onboarding.prevalidate":   {"ip": (2.0, 30), "tenant": (5.0, 60)},
+        "onboarding.accept":        {"ip": (0.5, 10), "tenant": (1.0, 20)},
+        "onboarding.create_invite": {"ip": (2.0, 30), "tenant": (2.0, 30)},
+    }
+    # Shed limited endpoints once this worker's threads are all busy (all requests count)
+    SHED_MAX_INFLIGHT = int(os.getenv("SHED_MAX_INFLIGHT", os.getenv("GUNICORN_THREADS", "4")))
+    # ...or once requests waited this long in front of the app (X-Request-Start from the proxy; 0 = off)
+    SHED_MAX_QUEUE_MS = int(os.getenv("SHED_MAX_QUEUE_MS", "1000"))
+    SHED_POOL_SATURATION = float(os.getenv("SHED_POOL_SATURATION", "0.9"))
+    # Reverse proxies in front of the app; X-Forwarded-* / X-Request-Start are trusted only if > 0
+    TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "0"))
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")  # send as X-Metrics-Token to read /admin/metrics
+
+    # Session bootstrap (/auth/me/context)
+    CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("CONTEXT_CACHE_TTL_SECONDS", "120"))
+    CONTEXT_UPCOMING_DAYS = int(os.getenv("CONTEXT_UPCOMING_DAYS", "14"))
+
+    # Company-wide scheduling runs
+    SOLVER_WORKERS = int(os.getenv("SOLVER_WORKERS", "0"))  # 0 = os.cpu_count()
+    SOLVER_MAX_WEEKLY_MINUTES = int(os.getenv("SOLVER_MAX_WEEKLY_MINUTES", str(40 * 60)))
+    SOLVER_MP_CONTEXT = os.getenv("SOLVER_MP_CONTEXT", "spawn")
+    SOLVER_POLL_SECONDS = int(os.getenv("SOLVER_POLL_SECONDS", "15"))  # worker checks the run queue
+    SOLVER_RUN_TIMEOUT_SECONDS = int(os.getenv("SOLVER_RUN_TIMEOUT_SECONDS", "3600"))
+    SOLVER_NIGHTLY_HOUR = int(os.getenv("SOLVER_NIGHTLY_HOUR", "-1"))  # queue next week for all companies; -1 = off
+
+    # Audit log (buffered, written in batches by a background thread)
+    AUDIT_ENABLED = os.getenv("AUDIT_ENABLED", "1") == "1"
+    AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+    AUDIT_PARTITION_MONTHS_AHEAD = int(os.getenv("AUDIT_PARTITION_MONTHS_AHEAD", "2"))
+    AUDIT_HISTORY_MAX_LIMIT = int(os.getenv("AUDIT_HISTORY_MAX_LIMIT", "500"))
+
+    # Shift listing and response compression
+    SHIFT_LIST_MAX_DAYS = int(os.getenv("SHIFT_LIST_MAX_DAYS", "62"))
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "1") == "1"
+    COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+
+    # Startup: import every controller/service while building the app (use with a
+    # preloading server so forked workers share the imported code copy-on-write)
+    PRELOAD_WARM = os.getenv("PRELOAD_WARM", "0") == "1"
+
 class DevConfig(Config):
     DEBUG = True
 
@@ -0,0 +1,42 @@
+# controllers/audit_controller.py
+from datetime import datetime
+
+from flask import current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from services.audit_service import AuditService, AUDITED
+from utils.authz import company_position, is_manager
+
+ENTITIES = {name for name, _ in AUDITED.values()}
+
+
+class AuditController:
+    def __init__(self):
+        self.audit = AuditService()
+
+    # Manager/Owner endpoint: change history of one entity, newest first
+    @jwt_required()
+    def history(self, entity: str, entity_id: str):
+        if entity not in ENTITIES:
+            return jsonify({"error": f"entity must be one of {sorted(ENTITIES)}"}), 400
+
+        comp_id = request.args.get("comp_id", type=int)
+        if not comp_id:
+            return jsonify({"error": "comp_id is required"}), 400
+
+        max_limit = current_app.config["AUDIT_HISTORY_MAX_LIMIT"]
+        limit = request.args.get("limit", 50, type=int)
+        if not limit or limit < 1 or limit > max_limit:
+            return jsonify({"error": f"limit must be between 1 and {max_limit}"}), 400
+
+        before = request.args.get("before")
+        if before:
+            try:
+                before = datetime.fromisoformat(before)
+            except ValueError:
+                return jsonify({"error": "before must be an ISO-8601 timestamp"}), 400
+
+        caller_id = int(get_jwt_identity())
+        if not is_manager(company_position(caller_id, comp_id)):
+            return jsonify({"error": "not authorized"}), 403
+
+        return jsonify(self.audit.history(comp_id, entity, entity_id, limit, before or None)), 200
@@ -1,18 +1,21 @@
 # controllers/auth_controller.py
 from typing import Any, Dict
-from flask import jsonify, request
+from flask import Response, current_app, jsonify, request
 from flask_jwt_extended import (
     create_access_token, create_refresh_token,
     jwt_required, get_jwt_identity
 )
 from services.registration_service import RegistrationService
 from services.auth_service import AuthService  # your existing simple auth logic
+from services.context_service import ContextService
+from utils.ratelimit import record_failed_login
 
 class AuthController:
     
     def __init__(self) -> None:
         self.reg_service = RegistrationService()
         self.auth_service = AuthService()
+        self.context_service = None  # built on first use from app config
 
     # -------- Registration (Wizard) --------
     def register(self):
@@ -50,6 +53,7 @@ class AuthController:
 
         user = self.auth_service.authenticate(data["email"].strip(), data["password"])
         if not user:
+            record_failed_login()
             return jsonify({"error": "Invalid credentials, Try again with correct details!"}), 401
 
         access = create_access_token(identity=str(user.user_id))
@@ -72,3 +76,15 @@ class AuthController:
     def me(self):
         user_id = get_jwt_identity()
         return jsonify({"user_id": int(user_id)})
+
+    # -------- Session bootstrap --------
+    @jwt_required()
+    def me_context(self):
+        if self.context_service is None:
+            cfg = current_app.config
+            self.context_service = ContextService(ttl_seconds=cfg["CONTEXT_CACHE_TTL_SECONDS"],
+                                                  upcoming_days=cfg["CONTEXT_UPCOMING_DAYS"])
+        payload = self.context_service.get_payload(int(get_jwt_identity()))
+        if payload is None:
+            return jsonify({"error": "user not found"}), 404
+        return Response(payload, mimetype="application/json")
@@ -0,0 +1,99 @@
+# controllers/document_controller.py
+import os
+from flask import Response, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from werkzeug.datastructures import ContentRange
+from services.document_service import DocumentService
+from utils.authz import company_position, is_manager
+from utils.storage import READ_SIZE
+
+
+class DocumentController:
+    def __init__(self):
+        self.svc = DocumentService()
+
+    # Employee endpoint: raw request body is the file (streamed, never fully buffered)
+    @jwt_required()
+    def upload(self):
+        comp_id = request.args.get("comp_id", type=int)
+        name = request.args.get("name") or ""
+        if not comp_id or not name.strip():
+            return jsonify({"error": "comp_id and name are required"}), 400
+
+        max_bytes = current_app.config["DOCUMENT_MAX_BYTES"]
+        if request.content_length is not None and request.content_length > max_bytes:
+            return jsonify({"error": "File too large"}), 413
+
+        caller_id = int(get_jwt_identity())
+        if not company_position(caller_id, comp_id):
+            return jsonify({"error": "not authorized"}), 403
+
+        try:
+            doc, _ = self.svc.upload(
+                user_id=caller_id, comp_id=comp_id, doc_name=name,
+                content_type=request.mimetype or None, stream=request.stream,
+                max_bytes=max_bytes,
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # No dedup hint in the response: chunks are shared across companies, so
+        # it would reveal whether someone else already stored the same file
+        return jsonify(self.svc.serialize(doc)), 201
+
+    @jwt_required()
+    def list(self):
+        caller_id = int(get_jwt_identity())
+        docs = self.svc.list_for_user(caller_id, comp_id=request.args.get("comp_id", type=int))
+        return jsonify({"documents": [self.svc.serialize(d) for d in docs]})
+
+    # Owner of the document, or a manager of its company
+    @jwt_required()
+    def download(self, doc_id: int):
+        doc = self.svc.get(doc_id)
+        if not doc or not doc.sha256:
+            return jsonify({"error": "document not found"}), 404
+
+        caller_id = int(get_jwt_identity())
+        if doc.user_id != caller_id and not is_manager(company_position(caller_id, doc.comp_id)):
+            return jsonify({"error": "not authorized"}), 403
+
+        size = int(doc.size_bytes)
+        start, stop, status = 0, size, 200
+        if request.range is not None:
+            bounds = request.range.range_for_length(size)
+            if bounds is not None:
+                (start, stop), status = bounds, 206
+            elif len(request.range.ranges) == 1:
+                resp = Response(status=416)
+                resp.content_range = ContentRange("bytes", None, None, size)
+                return resp
+            # multi-range requests fall through to a full 200 response
+
+        resp = Response(self._body(doc.sha256, start, stop), status=status,
+                        mimetype=doc.content_type or "application/octet-stream",
+                        direct_passthrough=True)
+        resp.content_length = stop - start
+        resp.accept_ranges = "bytes"
+        if status == 206:
+            resp.content_range = ContentRange("bytes", start, stop, size)
+        resp.set_etag(doc.sha256)
+        resp.headers.set("Content-Disposition", "attachment", filename=doc.doc_name)
+        resp.headers["Cache-Control"] = "private, max-age=3600"
+        return resp
+
+    def _body(self, key: str, start: int, stop: int):
+        storage = self.svc.storage
+        segments = storage.local_segments(key, start, stop)
+        wrapper = request.environ.get("wsgi.file_wrapper")
+
+        # Range maps to the tail of one chunk file: hand the positioned file to the
+        # server's file_wrapper, which gunicorn serves with sendfile(2) (zero-copy).
+        if wrapper and segments and len(segments) == 1:
+            seg = segments[0]
+            fh = open(seg.path, "rb")
+            if seg.offset + seg.length == os.fstat(fh.fileno()).st_size:
+                fh.seek(seg.offset)
+                return wrapper(fh, READ_SIZE)
+            fh.close()
+        return storage.read_range(key, start, stop)
@@ -0,0 +1,24 @@
+# controllers/location_controller.py
+from flask import Response, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from services.forecast_service import ForecastService
+from utils.authz import location_position, is_manager
+
+
+class LocationController:
+    def __init__(self):
+        self.forecasts = ForecastService()
+
+    # Manager/Owner endpoint: staffing demand curves per weekday
+    @jwt_required()
+    def demand(self, location_id: int):
+        cfg = current_app.config
+        weeks = request.args.get("weeks", cfg["DEMAND_DEFAULT_WEEKS"], type=int)
+        if not weeks or weeks < 1 or weeks > cfg["DEMAND_MAX_WEEKS"]:
+            return jsonify({"error": f"weeks must be between 1 and {cfg['DEMAND_MAX_WEEKS']}"}), 400
+
+        caller_id = int(get_jwt_identity())
+        if not is_manager(location_position(caller_id, location_id)):
+            return jsonify({"error": "not authorized"}), 403
+
+        return Response(self.forecasts.get_forecast(location_id, weeks), mimetype="application/json")
@@ -1,5 +1,5 @@
 # controllers/onboarding_controller.py
-from flask import request, jsonify
+from flask import current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services.onboarding_service import OnboardingService
 from models import Employment
@@ -16,7 +16,7 @@ class OnboardingController:
         email = data.get("email")
         location_id = data.get("location_id")
         position = data.get("position", "Employee")
-        ttl_days = int(data.get("ttl_days", 7))
+        ttl_days = int(data.get("ttl_days", current_app.config["INVITE_TTL_DAYS"]))
 
         if not comp_id or not email:
             return jsonify({"error": "comp_id and email are required"}), 400
@@ -0,0 +1,126 @@
+# controllers/schedule_controller.py
+from datetime import date, datetime, time, timedelta
+from flask import Response, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from services.schedule_service import ScheduleService, LIST_FIELDS
+from services.company_solver_service import SolverRunService
+from utils.authz import company_position, location_position, is_manager
+
+
+def _parse_week(raw):
+    try:
+        return date.fromisoformat((raw or "").strip())
+    except ValueError:
+        return None
+
+
+class ScheduleController:
+    def __init__(self):
+        self.svc = ScheduleService()
+
+    # Manager/Owner endpoint: publish a location's week
+    @jwt_required()
+    def publish(self, location_id: int):
+        data = request.get_json() or {}
+        week = _parse_week(data.get("week"))
+        if not week:
+            return jsonify({"error": "week (YYYY-MM-DD) is required"}), 400
+
+        caller_id = int(get_jwt_identity())
+        if not is_manager(location_position(caller_id, location_id)):
+            return jsonify({"error": "not authorized to publish"}), 403
+
+        try:
+            snapshot, changes, created = self.svc.publish_week(location_id, week, published_by=caller_id)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify({
+            "snapshot_id": int(snapshot.snapshot_id),
+            "location_id": location_id,
+            "week_start": snapshot.week_start.isoformat(),
+            "version": snapshot.version,
+            "shift_count": snapshot.shift_count,
+            "changes": changes,
+        }), (201 if created else 200)
+
+    # Employee endpoint: read the published week (stored payload, served as-is)
+    @jwt_required()
+    def published(self, location_id: int):
+        week = _parse_week(request.args.get("week"))
+        if not week:
+            return jsonify({"error": "week (YYYY-MM-DD) is required"}), 400
+        version = request.args.get("version", type=int)
+
+        caller_id = int(get_jwt_identity())
+        if not location_position(caller_id, location_id):
+            return jsonify({"error": "not authorized"}), 403
+
+        snapshot = self.svc.get_snapshot(location_id, week, version=version)
+        if not snapshot:
+            return jsonify({"error": "schedule not published"}), 404
+        return Response(snapshot.payload, mimetype="application/json")
+
+    # Employee endpoint: live shift listing for a date range, with ?fields= sparse fieldsets.
+    # Employees see published shifts only; managers also see drafts.
+    @jwt_required()
+    def shifts(self, location_id: int):
+        start, end = _parse_week(request.args.get("from")), _parse_week(request.args.get("to"))
+        if not start or not end or end < start:
+            return jsonify({"error": "from and to (YYYY-MM-DD, from <= to) are required"}), 400
+        max_days = current_app.config["SHIFT_LIST_MAX_DAYS"]
+        if (end - start).days + 1 > max_days:
+            return jsonify({"error": f"range must be at most {max_days} days"}), 400
+
+        raw = request.args.get("fields")
+        if raw:
+            fields = [f for f in dict.fromkeys(p.strip() for p in raw.split(",")) if f and f != "shift_id"]
+        else:
+            fields = list(LIST_FIELDS)
+
+        caller_id = int(get_jwt_identity())
+        position = location_position(caller_id, location_id)
+        if not position:
+            return jsonify({"error": "not authorized"}), 403
+        statuses = None if is_manager(position) else ["published"]
+
+        try:
+            shifts = self.svc.list_shifts(location_id,
+                                          datetime.combine(start, time.min),
+                                          datetime.combine(end + timedelta(days=1), time.min),
+                                          fields, statuses)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"location_id": location_id, "fields": ["shift_id"] + fields, "shifts": shifts})
+
+    # Manager/Owner endpoint: queue a run that fills open draft shifts across every
+    # location of a company. The worker executes it; poll solve_status for the report.
+    @jwt_required()
+    def solve_company(self, comp_id: int):
+        data = request.get_json() or {}
+        week = _parse_week(data.get("week"))
+        if not week:
+            return jsonify({"error": "week (YYYY-MM-DD) is required"}), 400
+
+        caller_id = int(get_jwt_identity())
+        if not is_manager(company_position(caller_id, comp_id)):
+            return jsonify({"error": "not authorized to schedule"}), 403
+
+        try:
+            run, created = SolverRunService.enqueue(comp_id, week, dry_run=bool(data.get("dry_run")),
+                                                    requested_by=caller_id)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 409
+        return jsonify(SolverRunService.serialize(run)), (202 if created else 200)
+
+    # Manager/Owner endpoint: status (and report, once done) of a queued run
+    @jwt_required()
+    def solve_status(self, comp_id: int, run_id: int):
+        caller_id = int(get_jwt_identity())
+        if not is_manager(company_position(caller_id, comp_id)):
+            return jsonify({"error": "not authorized"}), 403
+
+        run = SolverRunService.get(comp_id, run_id)
+        if not run:
+            return jsonify({"error": "run not found"}), 404
+        return jsonify(SolverRunService.serialize(run))
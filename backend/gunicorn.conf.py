@@ -0,0 +1,25 @@
+# gunicorn.conf.py -- `gunicorn -c gunicorn.conf.py app:app`
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# Build the app once in the master; workers fork from it. DB pools are
+# re-created in each child (utils/forking.py). Set PRELOAD_WARM=1 to also
+# import all controllers/services before forking.
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+# JOBS_INPROCESS: start the scheduler thread in each worker, never in the master
+os.environ["JOBS_DEFER_START"] = "1"
+
+
+def post_worker_init(worker):
+    # Open DB_POOL_MIN connections before taking traffic (no-op if the DB is down)
+    from utils.dbpool import warm_pool
+    warm_pool(worker.wsgi)
+
+    scheduler = worker.wsgi.extensions.get("scheduler")
+    if scheduler is not None:
+        scheduler.start()
@@ -1,4 +1,5 @@
 import logging
+import re
 from logging.config import fileConfig
 
 from flask import current_app
@@ -45,6 +46,18 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# audit_log's monthly partitions are created at runtime by
+# services.audit_service.ensure_partitions, not by models; keep autogenerate
+# from emitting drop_table for them.
+AUDIT_PARTITION = re.compile(r"audit_log_(default|y\d{4}m\d{2})")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and reflected and AUDIT_PARTITION.fullmatch(name or ""):
+        return False
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -65,7 +78,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +107,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
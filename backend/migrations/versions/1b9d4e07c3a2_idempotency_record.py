@@ -0,0 +1,39 @@
+"""idempotency record
+
+Revision ID: 1b9d4e07c3a2
+Revises: f7a2d9e61c44
+Create Date: 2025-10-15 16:48:33.902176
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b9d4e07c3a2'
+down_revision = 'f7a2d9e61c44'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('idempotency_record',
+    sa.Column('record_id', sa.BigInteger(), nullable=False),
+    sa.Column('scope', sa.Text(), nullable=False),
+    sa.Column('idem_key', sa.Text(), nullable=False),
+    sa.Column('fingerprint', sa.Text(), nullable=False),
+    sa.Column('status', sa.Text(), nullable=False),
+    sa.Column('response_status', sa.Integer(), nullable=True),
+    sa.Column('response_body', sa.Text(), nullable=True),
+    sa.Column('content_type', sa.Text(), nullable=True),
+    sa.Column('locked_at', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('record_id', name=op.f('pk_idempotency_record')),
+    sa.UniqueConstraint('scope', 'idem_key', name='ux_idempotency_record_scope_key')
+    )
+    op.create_index('ix_idempotency_record_expires_at', 'idempotency_record', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_idempotency_record_expires_at', table_name='idempotency_record')
+    op.drop_table('idempotency_record')
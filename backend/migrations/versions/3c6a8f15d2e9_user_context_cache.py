@@ -0,0 +1,33 @@
+"""user context cache
+
+Revision ID: 3c6a8f15d2e9
+Revises: 1b9d4e07c3a2
+Create Date: 2025-10-20 10:03:27.415862
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c6a8f15d2e9'
+down_revision = '1b9d4e07c3a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_context_cache',
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('built_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['app_user.user_id'], name=op.f('fk_user_context_cache_user_id_app_user'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', name=op.f('pk_user_context_cache'))
+    )
+    # Upcoming-assignment lookup for one user
+    op.create_index('ix_shift_assignment_user_id', 'shift_assignment', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_shift_assignment_user_id', table_name='shift_assignment')
+    op.drop_table('user_context_cache')
@@ -0,0 +1,54 @@
+"""audit log
+
+Revision ID: 5e8b1f3a7c60
+Revises: 3c6a8f15d2e9
+Create Date: 2025-10-21 09:12:44.108315
+
+"""
+from datetime import date
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8b1f3a7c60'
+down_revision = '3c6a8f15d2e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Range-partitioned by month; autogenerate does not emit PARTITION BY, so raw DDL
+    op.execute("""
+        CREATE TABLE audit_log (
+            audit_id    BIGSERIAL NOT NULL,
+            occurred_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            comp_id     BIGINT,
+            actor       TEXT,
+            entity      TEXT NOT NULL,
+            entity_id   TEXT NOT NULL,
+            action      TEXT NOT NULL,
+            changes     TEXT,
+            CONSTRAINT pk_audit_log PRIMARY KEY (audit_id, occurred_at)
+        ) PARTITION BY RANGE (occurred_at)
+    """)
+    op.execute(
+        "CREATE INDEX ix_audit_log_entity ON audit_log (comp_id, entity, entity_id, occurred_at)"
+    )
+    # Catch-all so a late partition job never loses writes
+    op.execute("CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT")
+    today = date.today()
+    nxt = (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+    for y, m in ((today.year, today.month), nxt):
+        ny, nm = (y + 1, 1) if m == 12 else (y, m + 1)
+        name = f"audit_log_y{y:04d}m{m:02d}"
+        lo, hi = f"'{y:04d}-{m:02d}-01'", f"'{ny:04d}-{nm:02d}-01'"
+        in_range = f"occurred_at >= {lo} AND occurred_at < {hi}"
+        op.execute(f"CREATE TABLE {name} (LIKE audit_log INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        op.execute(f"INSERT INTO {name} SELECT * FROM audit_log_default WHERE {in_range}")
+        op.execute(f"DELETE FROM audit_log_default WHERE {in_range}")
+        op.execute(f"ALTER TABLE audit_log ATTACH PARTITION {name} FOR VALUES FROM ({lo}) TO ({hi})")
+
+
+def downgrade():
+    op.execute("DROP TABLE audit_log")
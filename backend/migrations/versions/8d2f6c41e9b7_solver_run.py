@@ -0,0 +1,44 @@
+"""solver run queue
+
+Revision ID: 8d2f6c41e9b7
+Revises: 5e8b1f3a7c60
+Create Date: 2025-10-22 14:36:08.552190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2f6c41e9b7'
+down_revision = '5e8b1f3a7c60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('solver_run',
+    sa.Column('run_id', sa.BigInteger(), nullable=False),
+    sa.Column('comp_id', sa.BigInteger(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('dry_run', sa.Boolean(), nullable=False),
+    sa.Column('status', sa.Text(), nullable=False),
+    sa.Column('requested_by', sa.BigInteger(), nullable=True),
+    sa.Column('requested_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('report', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['comp_id'], ['company.comp_id'], name=op.f('fk_solver_run_comp_id_company'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['requested_by'], ['app_user.user_id'], name=op.f('fk_solver_run_requested_by_app_user'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('run_id', name=op.f('pk_solver_run'))
+    )
+    op.create_index('ux_solver_run_active', 'solver_run', ['comp_id'], unique=True,
+                    postgresql_where=sa.text("status IN ('queued', 'running')"))
+    op.create_index('ix_solver_run_status_run_id', 'solver_run', ['status', 'run_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_solver_run_status_run_id', table_name='solver_run')
+    op.drop_index('ux_solver_run_active', table_name='solver_run')
+    op.drop_table('solver_run')
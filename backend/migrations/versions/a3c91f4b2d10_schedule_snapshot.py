@@ -0,0 +1,40 @@
+"""schedule snapshot
+
+Revision ID: a3c91f4b2d10
+Revises: 7d32e2e9c7ee
+Create Date: 2025-10-06 10:12:41.503218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c91f4b2d10'
+down_revision = '7d32e2e9c7ee'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('schedule_snapshot',
+    sa.Column('snapshot_id', sa.BigInteger(), nullable=False),
+    sa.Column('location_id', sa.BigInteger(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('shift_count', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('published_by', sa.BigInteger(), nullable=True),
+    sa.Column('published_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['location_id'], ['location.loc_id'], name=op.f('fk_schedule_snapshot_location_id_location'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['published_by'], ['app_user.user_id'], name=op.f('fk_schedule_snapshot_published_by_app_user'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('snapshot_id', name=op.f('pk_schedule_snapshot')),
+    sa.UniqueConstraint('location_id', 'week_start', 'version', name='ux_schedule_snapshot_loc_week_ver')
+    )
+    # Publish filters draft shifts by location + week
+    op.create_index('ix_shift_location_id_start_time', 'shift', ['location_id', 'start_time'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_shift_location_id_start_time', table_name='shift')
+    op.drop_table('schedule_snapshot')
@@ -0,0 +1,36 @@
+"""invite expiry
+
+Revision ID: c58e0d7a9b31
+Revises: a3c91f4b2d10
+Create Date: 2025-10-08 09:41:17.228604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c58e0d7a9b31'
+down_revision = 'a3c91f4b2d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('onboarding_invite', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), server_default=sa.text("(now() at time zone 'utc')"), nullable=False))
+        batch_op.add_column(sa.Column('expires_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_onboarding_invite_status_expires_at', ['status', 'expires_at'], unique=False)
+
+    # Existing open invites get the default 7 day window from now
+    op.execute(
+        "UPDATE onboarding_invite SET expires_at = (now() at time zone 'utc') + interval '7 days' "
+        "WHERE status IN ('pending', 'sent') AND expires_at IS NULL"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('onboarding_invite', schema=None) as batch_op:
+        batch_op.drop_index('ix_onboarding_invite_status_expires_at')
+        batch_op.drop_column('expires_at')
+        batch_op.drop_column('created_at')
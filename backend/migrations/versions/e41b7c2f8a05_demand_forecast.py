@@ -0,0 +1,33 @@
+"""demand forecast
+
+Revision ID: e41b7c2f8a05
+Revises: c58e0d7a9b31
+Create Date: 2025-10-10 14:05:52.117930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41b7c2f8a05'
+down_revision = 'c58e0d7a9b31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('demand_forecast',
+    sa.Column('location_id', sa.BigInteger(), nullable=False),
+    sa.Column('weeks', sa.Integer(), nullable=False),
+    sa.Column('as_of', sa.Date(), nullable=False),
+    sa.Column('source_snapshot_id', sa.BigInteger(), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['location_id'], ['location.loc_id'], name=op.f('fk_demand_forecast_location_id_location'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('location_id', 'weeks', name=op.f('pk_demand_forecast'))
+    )
+
+
+def downgrade():
+    op.drop_table('demand_forecast')
@@ -0,0 +1,34 @@
+"""user document content metadata
+
+Revision ID: f7a2d9e61c44
+Revises: e41b7c2f8a05
+Create Date: 2025-10-13 11:26:08.640115
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7a2d9e61c44'
+down_revision = 'e41b7c2f8a05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_document', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_type', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('size_bytes', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('sha256', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('uploaded_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_user_document_sha256'), ['sha256'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_document', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_document_sha256'))
+        batch_op.drop_column('uploaded_at')
+        batch_op.drop_column('sha256')
+        batch_op.drop_column('size_bytes')
+        batch_op.drop_column('content_type')
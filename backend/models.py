@@ -1,6 +1,6 @@
 from datetime import datetime, date
 from sqlalchemy.dialects.postgresql import CITEXT
-from sqlalchemy import Date, DateTime, Time, Text, Boolean, BigInteger, UniqueConstraint
+from sqlalchemy import Date, DateTime, Time, Text, Boolean, BigInteger, Integer, UniqueConstraint
 from extensions import db
 
 # 1) Company
@@ -35,6 +35,10 @@ class UserDocument(db.Model):
     user_id  = db.Column(BigInteger, db.ForeignKey("app_user.user_id", ondelete="CASCADE"), nullable=False)
     comp_id  = db.Column(BigInteger, db.ForeignKey("company.comp_id",   ondelete="CASCADE"), nullable=False)
     doc_name = db.Column(Text, nullable=False)
+    content_type = db.Column(Text)
+    size_bytes   = db.Column(BigInteger)
+    sha256       = db.Column(Text, index=True)  # storage key; identical files share it
+    uploaded_at  = db.Column(DateTime, default=datetime.utcnow)
     user    = db.relationship("AppUser", back_populates="documents")
     company = db.relationship("Company")
 
@@ -53,6 +57,9 @@ class Location(db.Model):
 # 5) Shift
 class Shift(db.Model):
     __tablename__ = "shift"
+    __table_args__ = (
+        db.Index("ix_shift_location_id_start_time", "location_id", "start_time"),
+    )
     shift_id    = db.Column(BigInteger, primary_key=True)
     location_id = db.Column(BigInteger, db.ForeignKey("location.loc_id", ondelete="CASCADE"), nullable=False)
     start_time  = db.Column(DateTime, nullable=False)
@@ -65,7 +72,7 @@ class Shift(db.Model):
 class ShiftAssignment(db.Model):
     __tablename__ = "shift_assignment"
     shift_id    = db.Column(BigInteger, db.ForeignKey("shift.shift_id", ondelete="CASCADE"), primary_key=True)
-    user_id     = db.Column(BigInteger, db.ForeignKey("app_user.user_id", ondelete="CASCADE"), primary_key=True)
+    user_id     = db.Column(BigInteger, db.ForeignKey("app_user.user_id", ondelete="CASCADE"), primary_key=True, index=True)
     assigned_at = db.Column(DateTime, nullable=False, default=datetime.utcnow)
     shift = db.relationship("Shift", back_populates="assignments")
     user  = db.relationship("AppUser", back_populates="shift_assignments")
@@ -103,10 +110,104 @@ class Employment(db.Model):
 # 9) Onboarding / Invite
 class OnboardingInvite(db.Model):
     __tablename__ = "onboarding_invite"
+    __table_args__ = (
+        db.Index("ix_onboarding_invite_status_expires_at", "status", "expires_at"),
+    )
     form_id    = db.Column(BigInteger, primary_key=True)
     comp_id    = db.Column(BigInteger, db.ForeignKey("company.comp_id", ondelete="CASCADE"), nullable=False)
     location_id= db.Column(BigInteger, db.ForeignKey("location.loc_id", ondelete="SET NULL"))
     email      = db.Column(CITEXT, nullable=False)
-    status     = db.Column(Text, nullable=False, default="pending")
+    status     = db.Column(Text, nullable=False, default="pending")  # pending|sent|accepted|expired
+    created_at = db.Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(DateTime)
     company  = db.relationship("Company")
     location = db.relationship("Location")
+
+# 10) Published schedule snapshot (immutable; one row per publish)
+class ScheduleSnapshot(db.Model):
+    __tablename__ = "schedule_snapshot"
+    __table_args__ = (
+        UniqueConstraint("location_id", "week_start", "version", name="ux_schedule_snapshot_loc_week_ver"),
+    )
+    snapshot_id  = db.Column(BigInteger, primary_key=True)
+    location_id  = db.Column(BigInteger, db.ForeignKey("location.loc_id", ondelete="CASCADE"), nullable=False)
+    week_start   = db.Column(Date, nullable=False)  # monday
+    version      = db.Column(Integer, nullable=False)
+    shift_count  = db.Column(Integer, nullable=False)
+    payload      = db.Column(Text, nullable=False)  # compact JSON, serialized once at publish time
+    published_by = db.Column(BigInteger, db.ForeignKey("app_user.user_id", ondelete="SET NULL"))
+    published_at = db.Column(DateTime, nullable=False, default=datetime.utcnow)
+    location = db.relationship("Location")
+
+# 11) Demand forecast rollup (recomputed after new schedules are published)
+class DemandForecast(db.Model):
+    __tablename__ = "demand_forecast"
+    location_id        = db.Column(BigInteger, db.ForeignKey("location.loc_id", ondelete="CASCADE"), primary_key=True)
+    weeks              = db.Column(Integer, primary_key=True)
+    as_of              = db.Column(Date, nullable=False)  # monday; history window ends here (exclusive)
+    source_snapshot_id = db.Column(BigInteger)  # latest schedule_snapshot seen when computed
+    payload            = db.Column(Text, nullable=False)  # compact JSON
+    computed_at        = db.Column(DateTime, nullable=False, default=datetime.utcnow)
+    location = db.relationship("Location")
+
+# 12) Idempotency keys (replay cache for retried write requests)
+class IdempotencyRecord(db.Model):
+    __tablename__ = "idempotency_record"
+    __table_args__ = (
+        UniqueConstraint("scope", "idem_key", name="ux_idempotency_record_scope_key"),
+        db.Index("ix_idempotency_record_expires_at", "expires_at"),
+    )
+    record_id       = db.Column(BigInteger, primary_key=True)
+    scope           = db.Column(Text, nullable=False)  # "POST /auth/register" (+ " user:<id>")
+    idem_key        = db.Column(Text, nullable=False)
+    fingerprint     = db.Column(Text, nullable=False)  # HMAC-SHA256 of the request body (app secret)
+    status          = db.Column(Text, nullable=False, default="in_flight")  # in_flight|done
+    response_status = db.Column(Integer)
+    response_body   = db.Column(Text)  # Fernet-encrypted (utils/idempotency.py)
+    content_type    = db.Column(Text)
+    locked_at       = db.Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at      = db.Column(DateTime, nullable=False)
+
+# 13) Cached /auth/me/context payload (rows deleted on employment/assignment writes)
+class UserContextCache(db.Model):
+    __tablename__ = "user_context_cache"
+    user_id  = db.Column(BigInteger, db.ForeignKey("app_user.user_id", ondelete="CASCADE"), primary_key=True)
+    payload  = db.Column(Text, nullable=False)
+    built_at = db.Column(DateTime, nullable=False, default=datetime.utcnow)
+
+# 14) Audit log (append-only; range-partitioned by month on occurred_at)
+class AuditLog(db.Model):
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        db.Index("ix_audit_log_entity", "comp_id", "entity", "entity_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+    audit_id    = db.Column(BigInteger, primary_key=True, autoincrement=True)
+    occurred_at = db.Column(DateTime, primary_key=True, default=datetime.utcnow)
+    comp_id     = db.Column(BigInteger)  # no FK: audit rows outlive what they describe
+    actor       = db.Column(Text)        # JWT identity of the caller, if any
+    entity      = db.Column(Text, nullable=False)  # shift|shift_assignment|employment|onboarding_invite
+    entity_id   = db.Column(Text, nullable=False)  # "<shift_id>:<user_id>" for shift_assignment
+    action      = db.Column(Text, nullable=False)  # insert|update|delete
+    changes     = db.Column(Text)        # compact JSON: {col: value} or {col: [old, new]}
+
+# 15) Company solver runs (queued by the API, executed by the worker)
+class SolverRun(db.Model):
+    __tablename__ = "solver_run"
+    __table_args__ = (
+        # At most one queued/running run per company
+        db.Index("ux_solver_run_active", "comp_id", unique=True,
+                 postgresql_where=db.text("status IN ('queued', 'running')")),
+        db.Index("ix_solver_run_status_run_id", "status", "run_id"),
+    )
+    run_id       = db.Column(BigInteger, primary_key=True)
+    comp_id      = db.Column(BigInteger, db.ForeignKey("company.comp_id", ondelete="CASCADE"), nullable=False)
+    week_start   = db.Column(Date, nullable=False)  # monday
+    dry_run      = db.Column(Boolean, nullable=False, default=False)
+    status       = db.Column(Text, nullable=False, default="queued")  # queued|running|done|failed
+    requested_by = db.Column(BigInteger, db.ForeignKey("app_user.user_id", ondelete="SET NULL"))
+    requested_at = db.Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at   = db.Column(DateTime)
+    finished_at  = db.Column(DateTime)
+    report       = db.Column(Text)  # compact JSON from CompanySolverService.run
+    error        = db.Column(Text)
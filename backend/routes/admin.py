@@ -0,0 +1,46 @@
+# routes/admin.py
+from flask import Blueprint, abort, current_app, jsonify, request, send_file
+from utils.profiling import PROFILE_HEADER, store_for, token_matches
+from utils.ratelimit import limiter_metrics
+
+router = Blueprint("admin", __name__, url_prefix="/admin")
+METRICS_HEADER = "X-Metrics-Token"
+
+
+# Profile routes require the privileged X-Profile header; metrics have their own token
+# so they can be read without turning on request profiling
+@router.before_request
+def require_token():
+    if request.endpoint == "admin.metrics":
+        supplied, setting = request.headers.get(METRICS_HEADER), "METRICS_TOKEN"
+    else:
+        supplied, setting = request.headers.get(PROFILE_HEADER), "PROFILE_TOKEN"
+    if not token_matches(current_app, supplied, setting):
+        abort(404)
+
+# Recent request profiles (newest first)
+@router.get("/profiles")
+def list_profiles():
+    return jsonify({"profiles": store_for(current_app).list()})
+
+# One profile: timings, SQL statements and the top functions by cumulative time
+@router.get("/profiles/<profile_id>")
+def get_profile(profile_id):
+    summary = store_for(current_app).get(profile_id)
+    if not summary:
+        return jsonify({"error": "profile not found"}), 404
+    return jsonify(summary)
+
+# Raw pstats dump (open with pstats / snakeviz)
+@router.get("/profiles/<profile_id>/download")
+def download_profile(profile_id):
+    path = store_for(current_app).prof_path(profile_id)
+    if not path:
+        return jsonify({"error": "profile not found"}), 404
+    return send_file(path, mimetype="application/octet-stream", as_attachment=True,
+                     download_name=f"{profile_id}.prof")
+
+# Rate limiter / load shedding state for this worker process
+@router.get("/metrics")
+def metrics():
+    return jsonify({"rate_limit": limiter_metrics()})
@@ -0,0 +1,13 @@
+# routes/audit.py
+from flask import Blueprint
+from utils.lazy import Lazy
+from flask_jwt_extended import jwt_required
+
+router = Blueprint("audit", __name__, url_prefix="/audit")
+ctrl = Lazy("controllers.audit_controller:AuditController")
+
+# Change history of one entity (?comp_id=, optional ?limit= and ?before= for paging)
+@router.get("/<entity>/<entity_id>")
+@jwt_required()
+def history(entity, entity_id):
+    return ctrl.history(entity, entity_id)
@@ -1,13 +1,15 @@
 # routes/auth.py
 from flask import Blueprint
-from controllers.auth_controller import AuthController
+from utils.lazy import Lazy
 from flask_jwt_extended import jwt_required
+from utils.idempotency import idempotent
 
 router = Blueprint("auth", __name__, url_prefix="/auth")
-auth = AuthController()
+auth = Lazy("controllers.auth_controller:AuthController")
 
 # Wizard Registration (Owner -> Company -> Location)
 @router.post("/register")
+@idempotent
 def register():
     return auth.register()
 
@@ -27,3 +29,9 @@ def refresh():
 @jwt_required()
 def me():
     return auth.me()
+
+# Everything the client needs at launch, in one call
+@router.get("/me/context")
+@jwt_required()
+def me_context():
+    return auth.me_context()
@@ -0,0 +1,25 @@
+# routes/documents.py
+from flask import Blueprint
+from utils.lazy import Lazy
+from flask_jwt_extended import jwt_required
+
+router = Blueprint("documents", __name__, url_prefix="/documents")
+ctrl = Lazy("controllers.document_controller:DocumentController")
+
+# Upload: raw body with Content-Type, ?comp_id=&name=
+@router.post("")
+@jwt_required()
+def upload():
+    return ctrl.upload()
+
+# Caller's documents (optionally ?comp_id=)
+@router.get("")
+@jwt_required()
+def list_documents():
+    return ctrl.list()
+
+# Download (supports Range)
+@router.get("/<int:doc_id>/content")
+@jwt_required()
+def download(doc_id):
+    return ctrl.download(doc_id)
@@ -0,0 +1,22 @@
+# routes/health.py
+from flask import Blueprint, current_app, jsonify
+from extensions import db
+from utils.dbpool import check_db, pool_status
+
+router = Blueprint("health", __name__, url_prefix="/healthz")
+
+
+# Pool occupancy plus a timed checkout and SELECT 1; 503 when the DB is unreachable
+@router.get("/db")
+def db_health():
+    body = {"mode": current_app.config["DB_POOL_MODE"], "pool": pool_status(db.engine)}
+    stats = current_app.extensions.get("db_pool_stats")
+    if stats is not None:
+        body["events"] = stats.snapshot()
+    try:
+        body.update(check_db(db.engine))
+    except Exception as e:
+        body.update({"status": "unavailable", "error": type(e).__name__})
+        return jsonify(body), 503
+    body["status"] = "ok"
+    return jsonify(body), 200
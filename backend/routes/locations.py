@@ -0,0 +1,13 @@
+# routes/locations.py
+from flask import Blueprint
+from utils.lazy import Lazy
+from flask_jwt_extended import jwt_required
+
+router = Blueprint("locations", __name__, url_prefix="/locations")
+ctrl = Lazy("controllers.location_controller:LocationController")
+
+# Staffing demand forecast (?weeks= of history, default from config)
+@router.get("/<int:location_id>/demand")
+@jwt_required()
+def demand(location_id):
+    return ctrl.demand(location_id)
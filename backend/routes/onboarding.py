@@ -1,14 +1,16 @@
 # routes/onboarding.py
 from flask import Blueprint
-from controllers.onboarding_controller import OnboardingController
+from utils.lazy import Lazy
 from flask_jwt_extended import jwt_required
+from utils.idempotency import idempotent
 
 router = Blueprint("onboarding", __name__, url_prefix="/onboarding")
-ctrl = OnboardingController()
+ctrl = Lazy("controllers.onboarding_controller:OnboardingController")
 
 # Manager/Owner creates invite
 @router.post("/invite")
 @jwt_required()
+@idempotent
 def create_invite():
     return ctrl.create_invite()
 
@@ -19,5 +21,6 @@ def prevalidate():
 
 # Public: accept invite, set password, create/attach user+employment
 @router.post("/accept")
+@idempotent
 def accept():
     return ctrl.accept()
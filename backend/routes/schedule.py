@@ -0,0 +1,37 @@
+# routes/schedule.py
+from flask import Blueprint
+from utils.lazy import Lazy
+from flask_jwt_extended import jwt_required
+
+router = Blueprint("schedule", __name__, url_prefix="/schedules")
+ctrl = Lazy("controllers.schedule_controller:ScheduleController")
+
+# Manager/Owner publishes all draft shifts of a location's week
+@router.post("/<int:location_id>/publish")
+@jwt_required()
+def publish(location_id):
+    return ctrl.publish(location_id)
+
+# Employees read the latest (or a given ?version=) published snapshot
+@router.get("/<int:location_id>/published")
+@jwt_required()
+def published(location_id):
+    return ctrl.published(location_id)
+
+# Live shifts in a date range (?from=&to=, optional ?fields=start_time,end_time,status,...)
+@router.get("/<int:location_id>/shifts")
+@jwt_required()
+def shifts(location_id):
+    return ctrl.shifts(location_id)
+
+# Manager/Owner queues a company-wide solver run for a week ({"week": ..., "dry_run": bool})
+@router.post("/company/<int:comp_id>/solve")
+@jwt_required()
+def solve_company(comp_id):
+    return ctrl.solve_company(comp_id)
+
+# Status / report of a queued solver run
+@router.get("/company/<int:comp_id>/solve/<int:run_id>")
+@jwt_required()
+def solve_status(comp_id, run_id):
+    return ctrl.solve_status(comp_id, run_id)
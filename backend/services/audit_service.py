@@ -0,0 +1,343 @@
+# services/audit_service.py
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from flask import Flask, has_request_context
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, func, insert, inspect, select, text
+from sqlalchemy.orm import Session
+from extensions import db
+from models import AuditLog, Employment, Location, OnboardingInvite, Shift, ShiftAssignment
+
+logger = logging.getLogger(__name__)
+T = AuditLog.__table__
+PENDING_KEY = "_audit_pending"
+
+# model -> (entity name, entity id)
+AUDITED = {
+    Shift: ("shift", lambda o: str(o.shift_id)),
+    ShiftAssignment: ("shift_assignment", lambda o: f"{o.shift_id}:{o.user_id}"),
+    Employment: ("employment", lambda o: str(o.emp_id)),
+    OnboardingInvite: ("onboarding_invite", lambda o: str(o.form_id)),
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _dump(obj) -> str:
+    return json.dumps(obj, separators=(",", ":"), default=_json_default)
+
+
+def _actor() -> Optional[str]:
+    if not has_request_context():
+        return None
+    try:
+        return get_jwt_identity()
+    except RuntimeError:  # no JWT verified for this request
+        return None
+
+
+def make_record(entity: str, entity_id: str, action: str, changes: Optional[Dict] = None,
+                comp_id: Optional[int] = None, location_id: Optional[int] = None,
+                shift_id: Optional[int] = None) -> Dict:
+    """
+    One audit row. location_id / shift_id are hints the writer uses to fill
+    comp_id. Services doing set-based writes (which bypass session events)
+    build these themselves and stage() them.
+    """
+    return {
+        "occurred_at": datetime.utcnow(),
+        "comp_id": comp_id,
+        "actor": _actor(),
+        "entity": entity,
+        "entity_id": entity_id,
+        "action": action,
+        "changes": _dump(changes) if changes else None,
+        "_location_id": location_id,
+        "_shift_id": shift_id,
+    }
+
+
+def stage(session: Session, records: Iterable[Dict]) -> None:
+    """Stage records built with make_record; they are queued only if the transaction commits."""
+    session.info.setdefault(PENDING_KEY, []).extend(records)
+
+
+# ---------- Writer ----------
+class AuditWriter:
+    """
+    Buffers audit records in a bounded in-memory queue and writes them from a
+    background thread as batched multi-row INSERTs. Delivery is at-least-once:
+    failed batches are retried, a full queue makes the producer write inline
+    instead of dropping, and the queue is drained on interpreter shutdown.
+    The thread is (re)started lazily, so it also works in forked workers.
+    """
+
+    def __init__(self, app: Flask, queue_size: int, batch_size: int, interval: float) -> None:
+        self.app = app
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.interval = interval
+        self.queue: "queue.Queue[Dict]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        atexit.register(self.close)
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked child: the parent's queued records are the parent's to write
+                self.queue = queue.Queue(maxsize=self.queue_size)
+                self._stop = threading.Event()
+                self._lock = threading.Lock()
+                self._pid = os.getpid()
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, records: List[Dict]) -> None:
+        self._ensure_started()
+        overflow = []
+        for rec in records:
+            try:
+                self.queue.put_nowait(rec)
+            except queue.Full:
+                overflow.append(rec)
+        if overflow:
+            # One batched INSERT; back-pressure rather than loss. This runs from
+            # after_commit, so it must never raise: the business write already landed.
+            self._write_or_log(overflow)
+
+    def _take_batch(self, timeout: Optional[float]) -> List[Dict]:
+        try:
+            batch = [self.queue.get(timeout=timeout) if timeout else self.queue.get_nowait()]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._take_batch(self.interval)
+            delay = 0.5
+            while batch:
+                try:
+                    self._write(batch)
+                    batch = []
+                except Exception:
+                    logger.exception("audit batch of %d failed; retrying", len(batch))
+                    if self._stop.wait(delay):
+                        self._write_or_log(batch)
+                        return
+                    delay = min(delay * 2, 30)
+
+    def _write(self, batch: List[Dict]) -> None:
+        with self.app.app_context():
+            with db.engine.begin() as conn:
+                self._resolve_comp_ids(conn, batch)
+                conn.execute(insert(T), [
+                    {k: v for k, v in rec.items() if not k.startswith("_")} for rec in batch
+                ])
+
+    @staticmethod
+    def _resolve_comp_ids(conn, batch: List[Dict]) -> None:
+        locs = {r["_location_id"] for r in batch if r["comp_id"] is None and r.get("_location_id")}
+        shifts = {r["_shift_id"] for r in batch if r["comp_id"] is None and r.get("_shift_id")}
+        by_loc: Dict[int, int] = {}
+        by_shift: Dict[int, int] = {}
+        if locs:
+            by_loc = dict(conn.execute(
+                select(Location.loc_id, Location.comp_id).where(Location.loc_id.in_(locs))).all())
+        if shifts:
+            by_shift = dict(conn.execute(
+                select(Shift.shift_id, Location.comp_id)
+                .join(Location, Location.loc_id == Shift.location_id)
+                .where(Shift.shift_id.in_(shifts))).all())
+        for r in batch:
+            if r["comp_id"] is None:
+                r["comp_id"] = by_loc.get(r.get("_location_id")) or by_shift.get(r.get("_shift_id"))
+
+    def _write_or_log(self, batch: List[Dict]) -> None:
+        try:
+            self._write(batch)
+        except Exception:
+            logger.exception("audit: could not persist %d records", len(batch))
+            for rec in batch:
+                logger.error("audit record lost: %s", _dump(rec))
+
+    def close(self, timeout: float = 10.0) -> None:
+        if self._pid != os.getpid():
+            return
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        while True:
+            batch = self._take_batch(None)
+            if not batch:
+                break
+            self._write_or_log(batch)
+
+
+# ---------- Change capture ----------
+def _changes(obj, action: str) -> Dict:
+    state = inspect(obj)
+    out = {}
+    for attr in state.mapper.column_attrs:
+        key = attr.key
+        if action == "update":
+            hist = state.attrs[key].history
+            if hist.has_changes():
+                old = hist.deleted[0] if hist.deleted else None
+                new = hist.added[0] if hist.added else None
+                out[key] = [old, new]
+        else:
+            value = getattr(obj, key)
+            if value is not None:
+                out[key] = value
+    return out
+
+
+def _capture_after_flush(session: Session, flush_context) -> None:
+    staged = []
+    for action, objs in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objs:
+            spec = AUDITED.get(type(obj))
+            if spec is None:
+                continue
+            changes = _changes(obj, action)
+            if action == "update" and not changes:
+                continue
+            name, ident = spec
+            staged.append(make_record(
+                name, ident(obj), action, changes,
+                comp_id=getattr(obj, "comp_id", None),
+                location_id=getattr(obj, "location_id", None),
+                shift_id=getattr(obj, "shift_id", None) if isinstance(obj, ShiftAssignment) else None,
+            ))
+    if staged:
+        stage(session, staged)
+
+
+def _forward_after_commit(session: Session) -> None:
+    pending = session.info.pop(PENDING_KEY, None)
+    writer = _writer
+    if pending and writer is not None:
+        writer.enqueue(pending)
+
+
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
+
+
+_writer: Optional[AuditWriter] = None
+
+
+def init_audit(app: Flask) -> None:
+    """Install change capture on all sessions and the batching writer for this app."""
+    global _writer
+    if not app.config["AUDIT_ENABLED"]:
+        return
+    _writer = AuditWriter(app,
+                          queue_size=app.config["AUDIT_QUEUE_SIZE"],
+                          batch_size=app.config["AUDIT_BATCH_SIZE"],
+                          interval=app.config["AUDIT_FLUSH_INTERVAL_SECONDS"])
+    app.extensions["audit_writer"] = _writer
+    for name, fn in (("after_flush", _capture_after_flush),
+                     ("after_commit", _forward_after_commit),
+                     ("after_rollback", _discard_after_rollback)):
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
+
+
+# ---------- Query / maintenance ----------
+class AuditService:
+    """Read side of the audit log, plus monthly partition maintenance."""
+
+    @staticmethod
+    def history(comp_id: int, entity: str, entity_id: str, limit: int = 50,
+                before: Optional[datetime] = None) -> Dict:
+        q = (
+            select(T.c.occurred_at, T.c.action, T.c.actor, T.c.changes)
+            .where(T.c.comp_id == comp_id, T.c.entity == entity, T.c.entity_id == entity_id)
+        )
+        if before is not None:
+            q = q.where(T.c.occurred_at < before)
+        rows = db.session.execute(q.order_by(T.c.occurred_at.desc()).limit(limit)).all()
+        return {
+            "entity": entity,
+            "entity_id": entity_id,
+            "fields": ["occurred_at", "action", "actor", "changes"],
+            "events": [
+                [r.occurred_at.isoformat(), r.action, r.actor, json.loads(r.changes) if r.changes else None]
+                for r in rows
+            ],
+        }
+
+    @staticmethod
+    def ensure_partitions(months_ahead: int = 2, today: Optional[date] = None) -> int:
+        """
+        Create monthly partitions from the current month through `months_ahead`
+        months out. Each month is its own transaction, so one failure doesn't
+        stop the rest; rows that landed in the DEFAULT partition meanwhile
+        (worker down at the turn of a month) are moved into the new partition.
+        """
+        today = today or date.today()
+        y, m = today.year, today.month
+        created = 0
+        for _ in range(months_ahead + 1):
+            name = partition_name(y, m)
+            try:
+                with db.engine.begin() as conn:
+                    if conn.execute(select(func.to_regclass(name))).scalar() is None:
+                        for stmt in month_partition_sql(y, m):
+                            conn.execute(text(stmt))
+                        created += 1
+            except Exception:
+                logger.exception("audit: could not create partition %s", name)
+            y, m = _next_month(y, m)
+        return created
+
+
+# ---------- Partition DDL (also used by the audit_log migration) ----------
+def _next_month(y: int, m: int):
+    return (y + 1, 1) if m == 12 else (y, m + 1)
+
+
+def partition_name(y: int, m: int) -> str:
+    return f"audit_log_y{y:04d}m{m:02d}"
+
+
+def month_partition_sql(y: int, m: int) -> List[str]:
+    """
+    Statements that create one month's partition, taking over any of its rows
+    from audit_log_default (a plain PARTITION OF fails if the default holds some).
+    Run them in one transaction.
+    """
+    ny, nm = _next_month(y, m)
+    name = partition_name(y, m)
+    lo, hi = f"'{y:04d}-{m:02d}-01'", f"'{ny:04d}-{nm:02d}-01'"
+    in_range = f"occurred_at >= {lo} AND occurred_at < {hi}"
+    return [
+        f"CREATE TABLE {name} (LIKE audit_log INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"INSERT INTO {name} SELECT * FROM audit_log_default WHERE {in_range}",
+        f"DELETE FROM audit_log_default WHERE {in_range}",
+        f"ALTER TABLE audit_log ATTACH PARTITION {name} FOR VALUES FROM ({lo}) TO ({hi})",
+    ]
@@ -0,0 +1,340 @@
+# services/company_solver_service.py
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import exists, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import Availability, Company, Employment, Location, Shift, ShiftAssignment, SolverRun
+from services.forecast_service import DAYS
+from services.schedule_service import ScheduleService
+from services.solver import MINUTES_PER_DAY, reconcile, solve_all, split_shared_hours
+from services.audit_service import make_record, stage
+
+logger = logging.getLogger(__name__)
+
+
+def _minutes(values: Sequence) -> np.ndarray:
+    """datetimes -> int64 minutes since the epoch."""
+    return np.array(values, dtype="datetime64[m]").astype(np.int64)
+
+
+def _tod(t) -> int:
+    return t.hour * 60 + t.minute
+
+
+class CompanySolverService:
+    """
+    Company-wide scheduling run for one week.
+    Every location is an independent subproblem (its open draft shifts, the
+    employees who may work there, their availability and existing
+    commitments), packed as NumPy arrays and solved on a process pool.
+    Employees employed at several locations, or with no location (floaters),
+    appear in several subproblems with a share of their weekly hours in each
+    (split_shared_hours); reconcile() resolves the remaining conflicts.
+    Runs from the worker (SolverRunService), never inside an HTTP request.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_minutes: int = 40 * 60,
+                 mp_context: str = "spawn") -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.max_minutes = max_minutes
+        self.mp_context = mp_context
+
+    # ---------- Loading ----------
+    def build_payloads(self, comp_id: int, day: date):
+        _, start, end = ScheduleService.week_bounds(day)
+
+        loc_ids = db.session.execute(
+            select(Location.loc_id).where(Location.comp_id == comp_id).order_by(Location.loc_id)
+        ).scalars().all()
+        if not loc_ids:
+            raise ValueError("Company has no locations")
+
+        # Who may work where: location-specific employments plus floaters (location_id NULL)
+        staff: Dict[int, set] = defaultdict(set)
+        floaters = set()
+        for user_id, location_id in db.session.execute(
+            select(Employment.user_id, Employment.location_id)
+            .where(Employment.comp_id == comp_id, Employment.status == "active")
+        ).all():
+            if location_id is None:
+                floaters.add(user_id)
+            else:
+                staff[location_id].add(user_id)
+        all_users = set(floaters).union(*staff.values()) if staff else set(floaters)
+
+        # Open draft shifts: no assignment yet
+        shifts = db.session.execute(
+            select(Shift.shift_id, Shift.location_id, Shift.start_time, Shift.end_time)
+            .where(Shift.location_id.in_(loc_ids),
+                   Shift.status == "draft",
+                   Shift.start_time >= start,
+                   Shift.start_time < end,
+                   ~exists().where(ShiftAssignment.shift_id == Shift.shift_id))
+            .order_by(Shift.location_id, Shift.start_time)
+        ).all()
+
+        avail = db.session.execute(
+            select(Availability.user_id, Availability.location_id, Availability.day_of_week,
+                   Availability.start_time, Availability.end_time)
+            .where(Availability.location_id.in_(loc_ids), Availability.user_id.in_(all_users))
+        ).all() if all_users else []
+
+        # Existing commitments anywhere (any company) that overlap the week
+        busy_rows = db.session.execute(
+            select(ShiftAssignment.user_id, Shift.start_time, Shift.end_time)
+            .join(Shift, Shift.shift_id == ShiftAssignment.shift_id)
+            .where(ShiftAssignment.user_id.in_(all_users),
+                   Shift.start_time < end, Shift.end_time > start)
+        ).all() if all_users else []
+
+        busy: Dict[int, List] = defaultdict(list)
+        if busy_rows:
+            b_users, b_starts, b_ends = zip(*busy_rows)
+            for u, s, e in zip(b_users, _minutes(b_starts).tolist(), _minutes(b_ends).tolist()):
+                busy[int(u)].append((s, e))
+
+        shifts_by_loc: Dict[int, list] = defaultdict(list)
+        for row in shifts:
+            shifts_by_loc[row.location_id].append(row)
+        avail_by_loc: Dict[int, list] = defaultdict(list)
+        for row in avail:
+            avail_by_loc[row.location_id].append(row)
+
+        payloads = []
+        for loc_id in loc_ids:
+            rows = shifts_by_loc.get(loc_id, [])
+            if not rows:
+                continue
+            # Floaters only where they have availability; elsewhere they can't take a shift
+            here = {a.user_id for a in avail_by_loc.get(loc_id, [])}
+            users = np.array(sorted(staff.get(loc_id, set()) | (floaters & here)), np.int64)
+            index = {int(u): i for i, u in enumerate(users)}
+
+            ids, _, s_dt, e_dt = zip(*rows)
+            starts, ends = _minutes(s_dt), _minutes(e_dt)
+            av = [a for a in avail_by_loc.get(loc_id, []) if a.user_id in index and a.day_of_week in DAYS]
+            b = [(index[u], s, e) for u, iv in busy.items() if u in index for s, e in iv]
+
+            payloads.append({
+                "location_id": loc_id,
+                "shift_ids": np.array(ids, np.int64),
+                "starts": starts,
+                "ends": ends,
+                "dows": ((starts // MINUTES_PER_DAY) + 3) % 7,  # 1970-01-01 was a thursday
+                "start_tod": starts % MINUTES_PER_DAY,
+                "user_ids": users,
+                "av_user": np.array([index[a.user_id] for a in av], np.int64),
+                "av_dow": np.array([DAYS.index(a.day_of_week) for a in av], np.int64),
+                "av_start": np.array([_tod(a.start_time) for a in av], np.int64),
+                "av_end": np.array([_tod(a.end_time) or MINUTES_PER_DAY for a in av], np.int64),
+                "busy_user": np.array([x[0] for x in b], np.int64),
+                "busy_start": np.array([x[1] for x in b], np.int64),
+                "busy_end": np.array([x[2] for x in b], np.int64),
+                "max_minutes": self.max_minutes,
+                "alternatives": 3,
+            })
+        return payloads, dict(busy)
+
+    # ---------- Run ----------
+    def run(self, comp_id: int, day: date, dry_run: bool = False) -> Dict:
+        """
+        Load, solve, write. No transaction is held while solving: the load
+        commits first, and the write re-checks which shifts are still open
+        (row locks on just those shifts) so concurrent edits are not overwritten.
+        One run per company at a time is enforced by the solver_run queue.
+        """
+        timings = {}
+        try:
+            t0 = time.perf_counter()
+            payloads, busy = self.build_payloads(comp_id, day)
+            db.session.commit()
+            timings["load_ms"] = (time.perf_counter() - t0) * 1000
+
+            t0 = time.perf_counter()
+            split_shared_hours(payloads)
+            results = solve_all(payloads, workers=self.workers, mp_context=self.mp_context)
+            timings["solve_ms"] = (time.perf_counter() - t0) * 1000
+
+            t0 = time.perf_counter()
+            assignments, unfilled, reassigned = reconcile(results, busy, self.max_minutes)
+            timings["reconcile_ms"] = (time.perf_counter() - t0) * 1000
+
+            t0 = time.perf_counter()
+            stale = 0
+            if assignments and not dry_run:
+                still_open = set(db.session.execute(
+                    select(Shift.shift_id)
+                    .where(Shift.shift_id.in_([s for s, _ in assignments]),
+                           Shift.status == "draft",
+                           ~exists().where(ShiftAssignment.shift_id == Shift.shift_id))
+                    .with_for_update()
+                ).scalars().all())
+                fresh = [(s, u) for s, u in assignments if s in still_open]
+                stale = len(assignments) - len(fresh)
+                inserted = db.session.execute(
+                    insert(ShiftAssignment).on_conflict_do_nothing()
+                    .returning(ShiftAssignment.shift_id, ShiftAssignment.user_id),
+                    [{"shift_id": s, "user_id": u} for s, u in fresh],
+                ).all() if fresh else []
+                stage(db.session, [
+                    make_record("shift_assignment", f"{s}:{u}", "insert", {"shift_id": s, "user_id": u},
+                                comp_id=comp_id)
+                    for s, u in inserted
+                ])
+            db.session.commit()
+            timings["write_ms"] = (time.perf_counter() - t0) * 1000
+        except Exception:
+            db.session.rollback()
+            raise
+
+        open_shifts = sum(len(p["shift_ids"]) for p in payloads)
+        return {
+            "comp_id": comp_id,
+            "week_start": ScheduleService.week_bounds(day)[0].isoformat(),
+            "dry_run": dry_run,
+            "workers": self.workers,
+            "locations": len(payloads),
+            "open_shifts": open_shifts,
+            "assigned": len(assignments) - stale,
+            "unfilled": len(unfilled),
+            "reassigned_in_reconcile": reassigned,
+            "skipped_changed_since_load": stale,
+            "timings_ms": {k: round(v, 1) for k, v in timings.items()},
+        }
+
+
+class SolverRunService:
+    """
+    Queue of company solver runs. The API enqueues; worker.py executes them
+    one at a time per worker process (claimed with SKIP LOCKED). A partial
+    unique index allows one queued/running run per company.
+    """
+
+    def __init__(self, solver: Optional[CompanySolverService] = None, timeout_seconds: int = 3600) -> None:
+        self.solver = solver or CompanySolverService()
+        self.timeout = timedelta(seconds=timeout_seconds)
+
+    @staticmethod
+    def enqueue(comp_id: int, day: date, dry_run: bool = False,
+                requested_by: Optional[int] = None) -> Tuple[SolverRun, bool]:
+        """Returns (run, created). An already active run for the company is returned as-is."""
+        week_start, _, _ = ScheduleService.week_bounds(day)
+        run = SolverRun(comp_id=comp_id, week_start=week_start, dry_run=dry_run, requested_by=requested_by)
+        db.session.add(run)
+        try:
+            db.session.commit()
+            return run, True
+        except IntegrityError:
+            db.session.rollback()
+        active = SolverRun.query.filter(SolverRun.comp_id == comp_id,
+                                        SolverRun.status.in_(("queued", "running"))).first()
+        if active is None:
+            raise ValueError("Could not queue a scheduling run; retry")
+        return active, False
+
+    @staticmethod
+    def get(comp_id: int, run_id: int) -> Optional[SolverRun]:
+        return SolverRun.query.filter_by(comp_id=comp_id, run_id=run_id).first()
+
+    @staticmethod
+    def serialize(run: SolverRun) -> Dict:
+        return {
+            "run_id": int(run.run_id),
+            "comp_id": int(run.comp_id),
+            "week_start": run.week_start.isoformat(),
+            "dry_run": run.dry_run,
+            "status": run.status,
+            "requested_at": run.requested_at.isoformat() if run.requested_at else None,
+            "started_at": run.started_at.isoformat() if run.started_at else None,
+            "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+            "report": json.loads(run.report) if run.report else None,
+            "error": run.error,
+        }
+
+    def _fail_abandoned(self, now: datetime) -> None:
+        # A worker that died mid-run would otherwise block its company forever
+        db.session.execute(
+            update(SolverRun)
+            .where(SolverRun.status == "running", SolverRun.started_at <= now - self.timeout)
+            .values(status="failed", finished_at=now, error="abandoned (worker stopped)")
+        )
+        db.session.commit()
+
+    def _claim(self) -> Optional[Tuple[int, int, date, bool]]:
+        row = db.session.execute(
+            select(SolverRun.run_id, SolverRun.comp_id, SolverRun.week_start, SolverRun.dry_run)
+            .where(SolverRun.status == "queued")
+            .order_by(SolverRun.run_id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if row is None:
+            db.session.commit()
+            return None
+        db.session.execute(
+            update(SolverRun).where(SolverRun.run_id == row.run_id)
+            .values(status="running", started_at=datetime.utcnow())
+        )
+        db.session.commit()
+        return tuple(row)
+
+    def _finish(self, run_id: int, **values) -> None:
+        db.session.execute(
+            update(SolverRun).where(SolverRun.run_id == run_id)
+            .values(finished_at=datetime.utcnow(), **values)
+        )
+        db.session.commit()
+
+    def run_pending(self, max_runs: int = 10) -> int:
+        """Execute up to max_runs queued runs, oldest first."""
+        self._fail_abandoned(datetime.utcnow())
+        done = 0
+        for _ in range(max_runs):
+            claimed = self._claim()
+            if claimed is None:
+                break
+            run_id, comp_id, week_start, dry_run = claimed
+            try:
+                report = self.solver.run(comp_id, week_start, dry_run=dry_run)
+            except ValueError as e:
+                logger.warning("solver run %s rejected: %s", run_id, e)
+                self._finish(run_id, status="failed", error=str(e))
+            except Exception as e:
+                logger.exception("solver run %s failed", run_id)
+                self._finish(run_id, status="failed", error=str(e) or type(e).__name__)
+            else:
+                self._finish(run_id, status="done",
+                             report=json.dumps(report, separators=(",", ":")))
+            done += 1
+        return done
+
+    def enqueue_nightly(self, hour: int, now: Optional[datetime] = None) -> int:
+        """
+        During `hour` (local time), queue next week's run for every company
+        that has locations and no run for that week yet. Safe to call often.
+        """
+        now = now or datetime.now()
+        if now.hour != hour:
+            return 0
+        week_start, _, _ = ScheduleService.week_bounds(now.date() + timedelta(days=7))
+        comp_ids = db.session.execute(
+            select(Company.comp_id)
+            .where(exists().where(Location.comp_id == Company.comp_id),
+                   ~exists().where(SolverRun.comp_id == Company.comp_id,
+                                   SolverRun.week_start == week_start,
+                                   SolverRun.status != "failed"))
+        ).scalars().all()
+        queued = 0
+        for comp_id in comp_ids:
+            _, created = self.enqueue(comp_id, week_start)
+            queued += created
+        return queued
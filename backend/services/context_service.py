@@ -0,0 +1,164 @@
+# services/context_service.py
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from extensions import db
+from models import AppUser, Company, Employment, Location, Shift, ShiftAssignment, UserContextCache
+
+
+class ContextService:
+    """
+    Session bootstrap aggregate for /auth/me/context: the user, their
+    employments with company + location, and upcoming assignments, built with
+    two set-based queries and cached per user as serialized JSON.
+    Cache rows are deleted in the same transaction as any Employment,
+    ShiftAssignment or Shift write (see register_cache_invalidation).
+    """
+
+    def __init__(self, ttl_seconds: int = 120, upcoming_days: int = 14, max_assignments: int = 100) -> None:
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.upcoming = timedelta(days=upcoming_days)
+        self.max_assignments = max_assignments
+
+    @staticmethod
+    def _dump(obj: Dict) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    def build(self, user_id: int) -> Optional[Dict]:
+        now = datetime.utcnow()
+
+        # 1) user + employments + company + location in one outer-joined query
+        rows = db.session.execute(
+            select(AppUser.user_id, AppUser.username, AppUser.user_email, AppUser.display_name, AppUser.is_verified,
+                   Employment.emp_id, Employment.comp_id, Employment.location_id, Employment.position,
+                   Employment.status, Employment.start_date, Employment.end_date,
+                   Company.comp_name, Location.loc_name, Location.loc_address)
+            .select_from(AppUser)
+            .outerjoin(Employment, Employment.user_id == AppUser.user_id)
+            .outerjoin(Company, Company.comp_id == Employment.comp_id)
+            .outerjoin(Location, Location.loc_id == Employment.location_id)
+            .where(AppUser.user_id == user_id)
+            .order_by(Employment.emp_id)
+        ).all()
+        if not rows:
+            return None
+
+        first = rows[0]
+        companies: Dict[str, Dict] = {}
+        locations: Dict[str, Dict] = {}
+        employments = []
+        for r in rows:
+            if r.emp_id is None:
+                continue
+            companies[str(r.comp_id)] = {"comp_id": int(r.comp_id), "name": r.comp_name}
+            if r.location_id is not None:
+                locations[str(r.location_id)] = {
+                    "loc_id": int(r.location_id), "comp_id": int(r.comp_id),
+                    "name": r.loc_name, "address": r.loc_address,
+                }
+            employments.append({
+                "emp_id": int(r.emp_id),
+                "comp_id": int(r.comp_id),
+                "location_id": int(r.location_id) if r.location_id is not None else None,
+                "position": r.position,
+                "status": r.status,
+                "start_date": r.start_date.isoformat() if r.start_date else None,
+                "end_date": r.end_date.isoformat() if r.end_date else None,
+            })
+
+        # 2) upcoming published assignments, with their location
+        shifts = db.session.execute(
+            select(Shift.shift_id, Shift.location_id, Shift.start_time, Shift.end_time, Shift.status,
+                   Location.comp_id, Location.loc_name, Location.loc_address)
+            .join(ShiftAssignment, ShiftAssignment.shift_id == Shift.shift_id)
+            .join(Location, Location.loc_id == Shift.location_id)
+            .where(ShiftAssignment.user_id == user_id,
+                   Shift.status == "published",
+                   Shift.end_time >= now,
+                   Shift.start_time < now + self.upcoming)
+            .order_by(Shift.start_time)
+            .limit(self.max_assignments)
+        ).all()
+
+        assignments = []
+        for s in shifts:
+            locations.setdefault(str(s.location_id), {
+                "loc_id": int(s.location_id), "comp_id": int(s.comp_id),
+                "name": s.loc_name, "address": s.loc_address,
+            })
+            assignments.append({
+                "shift_id": int(s.shift_id),
+                "location_id": int(s.location_id),
+                "start_time": s.start_time.isoformat(),
+                "end_time": s.end_time.isoformat(),
+                "status": s.status,
+            })
+
+        return {
+            "user": {
+                "user_id": int(first.user_id),
+                "username": first.username,
+                "user_email": first.user_email,
+                "display_name": first.display_name,
+                "is_verified": first.is_verified,
+            },
+            "companies": companies,
+            "locations": locations,
+            "employments": employments,
+            "upcoming_assignments": assignments,
+            "built_at": now.isoformat(),
+        }
+
+    def get_payload(self, user_id: int) -> Optional[str]:
+        """Serialized context: one PK fetch on a hit, build + upsert on a miss."""
+        cached = db.session.get(UserContextCache, user_id)
+        if cached and cached.built_at >= datetime.utcnow() - self.ttl:
+            return cached.payload
+
+        ctx = self.build(user_id)
+        if ctx is None:
+            return None
+        payload = self._dump(ctx)
+        stmt = insert(UserContextCache).values(user_id=user_id, payload=payload, built_at=datetime.utcnow())
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=[UserContextCache.user_id],
+            set_={"payload": stmt.excluded.payload, "built_at": stmt.excluded.built_at},
+        ))
+        db.session.commit()
+        return payload
+
+    @staticmethod
+    def invalidate(user_ids: Iterable[int]) -> None:
+        """For Core bulk writes that bypass session events (e.g. schedule publish). Caller commits."""
+        ids = list(user_ids)
+        if ids:
+            db.session.execute(delete(UserContextCache).where(UserContextCache.user_id.in_(ids)))
+
+
+def _invalidate_after_flush(session: Session, flush_context) -> None:
+    user_ids: Set[int] = set()
+    shift_ids: Set[int] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (Employment, ShiftAssignment)) and obj.user_id is not None:
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, Shift) and obj.shift_id is not None:
+            shift_ids.add(obj.shift_id)
+    if not user_ids and not shift_ids:
+        return
+
+    conn = session.connection()
+    if user_ids:
+        conn.execute(delete(UserContextCache).where(UserContextCache.user_id.in_(user_ids)))
+    if shift_ids:
+        conn.execute(delete(UserContextCache).where(UserContextCache.user_id.in_(
+            select(ShiftAssignment.user_id).where(ShiftAssignment.shift_id.in_(shift_ids))
+        )))
+
+
+def register_cache_invalidation() -> None:
+    if not event.contains(Session, "after_flush", _invalidate_after_flush):
+        event.listen(Session, "after_flush", _invalidate_after_flush)
@@ -0,0 +1,71 @@
+# services/document_service.py
+from typing import BinaryIO, List, Optional, Tuple
+
+from flask import current_app
+from extensions import db
+from models import UserDocument
+from utils.storage import StorageBackend, StoredObject, storage_from_config
+
+
+class DocumentService:
+    """
+    Employee documents (certifications, IDs).
+    Content lives in a pluggable, content-addressed StorageBackend; the
+    user_document row holds metadata and the content hash, so identical files
+    uploaded by different users/companies are stored once.
+    """
+
+    def __init__(self, storage: Optional[StorageBackend] = None) -> None:
+        self._storage = storage
+
+    @property
+    def storage(self) -> StorageBackend:
+        # Built on first use so the backend follows the app's config
+        if self._storage is None:
+            self._storage = storage_from_config(current_app.config)
+        return self._storage
+
+    def upload(self, user_id: int, comp_id: int, doc_name: str,
+               content_type: Optional[str], stream: BinaryIO,
+               max_bytes: Optional[int] = None) -> Tuple[UserDocument, StoredObject]:
+        doc_name = (doc_name or "").strip()
+        if not doc_name:
+            raise ValueError("Document name is required")
+
+        stored = self.storage.put(stream, max_bytes=max_bytes)
+
+        doc = UserDocument(
+            user_id=user_id,
+            comp_id=comp_id,
+            doc_name=doc_name,
+            content_type=content_type or "application/octet-stream",
+            size_bytes=stored.size,
+            sha256=stored.key,
+        )
+        db.session.add(doc)
+        db.session.commit()
+        return doc, stored
+
+    @staticmethod
+    def list_for_user(user_id: int, comp_id: Optional[int] = None) -> List[UserDocument]:
+        q = UserDocument.query.filter_by(user_id=user_id)
+        if comp_id:
+            q = q.filter_by(comp_id=comp_id)
+        return q.order_by(UserDocument.doc_id.desc()).all()
+
+    @staticmethod
+    def get(doc_id: int) -> Optional[UserDocument]:
+        return UserDocument.query.get(doc_id)
+
+    @staticmethod
+    def serialize(doc: UserDocument) -> dict:
+        return {
+            "doc_id": int(doc.doc_id),
+            "user_id": int(doc.user_id),
+            "comp_id": int(doc.comp_id),
+            "doc_name": doc.doc_name,
+            "content_type": doc.content_type,
+            "size_bytes": doc.size_bytes,
+            "sha256": doc.sha256,
+            "uploaded_at": doc.uploaded_at.isoformat() if doc.uploaded_at else None,
+        }
@@ -0,0 +1,189 @@
+# services/forecast_service.py
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from extensions import db
+from models import Location, Shift, ShiftAssignment, ScheduleSnapshot, DemandForecast
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def _rolling_mean(a: np.ndarray, window: int) -> np.ndarray:
+    """Centered moving average along the last axis (edge-padded, same length)."""
+    if window <= 1:
+        return a.astype(np.float64)
+    left = window // 2
+    pad = [(0, 0)] * (a.ndim - 1) + [(left, window - 1 - left)]
+    c = np.cumsum(np.pad(a, pad, mode="edge"), axis=-1, dtype=np.float64)
+    c = np.concatenate([np.zeros(c.shape[:-1] + (1,)), c], axis=-1)
+    return (c[..., window:] - c[..., :-window]) / window
+
+
+class ForecastService:
+    """
+    Staffing demand forecasts from historical published shifts.
+    - headcount: 15-minute headcount time series per location (vectorized).
+    - forecast_many: per-weekday demand curves for a batch of locations.
+    - get_forecast: cached read; recomputed only when a newer schedule was
+      published for the location or the history window rolled over.
+    - refresh_stale: batch job recomputing every stale cached forecast.
+    """
+
+    def __init__(self, smoothing_slots: int = 4, batch_locations: int = 50) -> None:
+        self.smoothing_slots = smoothing_slots  # 4 x 15 min = 1h rolling mean
+        self.batch_locations = batch_locations
+
+    # ---------- Helpers ----------
+    @staticmethod
+    def current_as_of(today: Optional[date] = None) -> date:
+        today = today or date.today()
+        return today - timedelta(days=today.weekday())
+
+    @staticmethod
+    def _dump(obj: Dict) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    @staticmethod
+    def snapshot_tokens(location_ids: Sequence[int]) -> Dict[int, int]:
+        """Latest schedule_snapshot id per location; changes whenever a week is published."""
+        rows = db.session.execute(
+            select(ScheduleSnapshot.location_id, func.max(ScheduleSnapshot.snapshot_id))
+            .where(ScheduleSnapshot.location_id.in_(location_ids))
+            .group_by(ScheduleSnapshot.location_id)
+        ).all()
+        return {int(loc): int(token) for loc, token in rows}
+
+    # ---------- Computation ----------
+    def headcount(self, location_ids: Sequence[int], window_start: datetime, weeks: int) -> np.ndarray:
+        """
+        Headcount matrix of shape (len(location_ids), weeks * 7 * SLOTS_PER_DAY).
+        Each shift adds its assignee count over the 15-minute slots it covers.
+        """
+        n_slots = weeks * 7 * SLOTS_PER_DAY
+        window_end = window_start + timedelta(weeks=weeks)
+        index = {loc: i for i, loc in enumerate(location_ids)}
+
+        rows = db.session.execute(
+            select(Shift.location_id, Shift.start_time, Shift.end_time,
+                   func.count(ShiftAssignment.user_id))
+            .outerjoin(ShiftAssignment, ShiftAssignment.shift_id == Shift.shift_id)
+            .where(Shift.location_id.in_(location_ids),
+                   Shift.status == "published",
+                   Shift.start_time < window_end,
+                   Shift.end_time > window_start)
+            .group_by(Shift.shift_id)
+        ).all()
+
+        # Difference array: +hc at the first covered slot, -hc after the last; cumsum gives the series
+        diff = np.zeros((len(location_ids), n_slots + 1), dtype=np.int32)
+        if rows:
+            locs, starts, ends, counts = zip(*rows)
+            li = np.fromiter((index[l] for l in locs), dtype=np.int64, count=len(rows))
+            origin = np.datetime64(window_start, "m")
+            s = (np.array(starts, dtype="datetime64[m]") - origin).astype(np.int64)
+            e = (np.array(ends, dtype="datetime64[m]") - origin).astype(np.int64)
+            hc = np.array(counts, dtype=np.int32)
+
+            s_idx = np.clip(s // SLOT_MINUTES, 0, n_slots)
+            e_idx = np.clip(-(-e // SLOT_MINUTES), 0, n_slots)  # ceil
+            keep = (e_idx > s_idx) & (hc > 0)
+            np.add.at(diff, (li[keep], s_idx[keep]), hc[keep])
+            np.add.at(diff, (li[keep], e_idx[keep]), -hc[keep])
+
+        return np.cumsum(diff[:, :-1], axis=1, dtype=np.int32)
+
+    def forecast_many(self, location_ids: Sequence[int], weeks: int,
+                      as_of: Optional[date] = None) -> Dict[int, Dict]:
+        """Per-weekday demand curves for each location, from the `weeks` full weeks before as_of."""
+        as_of = as_of or self.current_as_of()
+        window_start = datetime.combine(as_of - timedelta(weeks=weeks), time.min)
+
+        series = self.headcount(location_ids, window_start, weeks)
+        by_week = series.reshape(len(location_ids), weeks, 7, SLOTS_PER_DAY)
+
+        mean = by_week.mean(axis=1)                   # seasonal (same weekday) average
+        p90 = np.percentile(by_week, 90, axis=1)      # busy-week level
+        smoothed = _rolling_mean(mean, self.smoothing_slots)
+        recommended = np.ceil(smoothed - 1e-9).astype(np.int32)
+
+        mean = np.round(mean, 2)
+        p90 = np.round(p90, 2)
+        out: Dict[int, Dict] = {}
+        for i, loc in enumerate(location_ids):
+            out[loc] = {
+                "location_id": int(loc),
+                "weeks": weeks,
+                "as_of": as_of.isoformat(),
+                "slot_minutes": SLOT_MINUTES,
+                "days": {
+                    day: {
+                        "mean": mean[i, d].tolist(),
+                        "p90": p90[i, d].tolist(),
+                        "recommended": recommended[i, d].tolist(),
+                    }
+                    for d, day in enumerate(DAYS)
+                },
+            }
+        return out
+
+    # ---------- Cache ----------
+    def _store(self, forecasts: Dict[int, Dict], tokens: Dict[int, int], weeks: int, as_of: date) -> None:
+        now = datetime.utcnow()
+        rows = [{
+            "location_id": loc,
+            "weeks": weeks,
+            "as_of": as_of,
+            "source_snapshot_id": tokens.get(loc),
+            "payload": self._dump(fc),
+            "computed_at": now,
+        } for loc, fc in forecasts.items()]
+        stmt = insert(DemandForecast).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DemandForecast.location_id, DemandForecast.weeks],
+            set_={c: stmt.excluded[c] for c in ("as_of", "source_snapshot_id", "payload", "computed_at")},
+        )
+        db.session.execute(stmt)
+        db.session.commit()
+
+    def get_forecast(self, location_id: int, weeks: int) -> str:
+        """Serialized forecast for one location, served from the rollup when still fresh."""
+        as_of = self.current_as_of()
+        token = self.snapshot_tokens([location_id]).get(location_id)
+
+        cached = DemandForecast.query.get((location_id, weeks))
+        if cached and cached.as_of == as_of and cached.source_snapshot_id == token:
+            return cached.payload
+
+        forecasts = self.forecast_many([location_id], weeks, as_of=as_of)
+        self._store(forecasts, {location_id: token}, weeks, as_of)
+        return self._dump(forecasts[location_id])
+
+    def refresh_stale(self, weeks: int, location_ids: Optional[Iterable[int]] = None) -> int:
+        """Batch job: recompute every cached-or-missing forecast that is out of date."""
+        as_of = self.current_as_of()
+        if location_ids is None:
+            location_ids = db.session.execute(select(Location.loc_id).order_by(Location.loc_id)).scalars().all()
+        location_ids = list(location_ids)
+
+        refreshed = 0
+        for i in range(0, len(location_ids), self.batch_locations):
+            chunk = location_ids[i:i + self.batch_locations]
+            tokens = self.snapshot_tokens(chunk)
+            existing = {
+                loc: (a, t) for loc, a, t in db.session.execute(
+                    select(DemandForecast.location_id, DemandForecast.as_of, DemandForecast.source_snapshot_id)
+                    .where(DemandForecast.location_id.in_(chunk), DemandForecast.weeks == weeks)
+                ).all()
+            }
+            stale = [loc for loc in chunk if existing.get(loc) != (as_of, tokens.get(loc))]
+            if not stale:
+                continue
+            self._store(self.forecast_many(stale, weeks, as_of=as_of), tokens, weeks, as_of)
+            refreshed += len(stale)
+        return refreshed
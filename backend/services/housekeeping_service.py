@@ -0,0 +1,105 @@
+# services/housekeeping_service.py
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.sql import Select
+from extensions import db
+from models import OnboardingInvite, Shift, IdempotencyRecord
+from services.audit_service import make_record, stage
+
+
+class HousekeepingService:
+    """
+    Periodic sweeps that keep hot tables small.
+    Every sweep works in bounded batches: each batch claims its rows with
+    FOR UPDATE SKIP LOCKED and commits, so locks are short and several workers
+    can sweep the same table in parallel without blocking each other.
+    """
+
+    def __init__(self, batch_size: int = 500, max_batches: int = 100) -> None:
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+
+    def _in_batches(self, pick: Select, apply: Callable[[List[int]], None]) -> int:
+        total = 0
+        for _ in range(self.max_batches):
+            ids = db.session.execute(
+                pick.limit(self.batch_size).with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not ids:
+                db.session.commit()
+                break
+            apply(ids)
+            db.session.commit()
+            total += len(ids)
+            if len(ids) < self.batch_size:
+                break
+        return total
+
+    # ---------- Sweeps ----------
+    def expire_invites(self, now: Optional[datetime] = None) -> int:
+        """Mark pending/sent invites past their expires_at as expired."""
+        now = now or datetime.utcnow()
+        pick = (
+            select(OnboardingInvite.form_id)
+            .where(OnboardingInvite.status.in_(("pending", "sent")),
+                   OnboardingInvite.expires_at <= now)
+            .order_by(OnboardingInvite.form_id)
+        )
+
+        def apply(ids: List[int]) -> None:
+            rows = db.session.execute(
+                update(OnboardingInvite)
+                .where(OnboardingInvite.form_id.in_(ids))
+                .values(status="expired")
+                .returning(OnboardingInvite.form_id, OnboardingInvite.comp_id)
+                .execution_options(synchronize_session=False)
+            )
+            stage(db.session, [
+                make_record("onboarding_invite", str(form_id), "update", {"status": [None, "expired"]}, comp_id=comp_id)
+                for form_id, comp_id in rows
+            ])
+
+        return self._in_batches(pick, apply)
+
+    def purge_stale_drafts(self, retention_days: int, now: Optional[datetime] = None) -> int:
+        """Delete draft shifts that ended more than `retention_days` ago (assignments cascade)."""
+        cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+        pick = (
+            select(Shift.shift_id)
+            .where(Shift.status == "draft", Shift.end_time < cutoff)
+            .order_by(Shift.shift_id)
+        )
+
+        def apply(ids: List[int]) -> None:
+            rows = db.session.execute(
+                delete(Shift)
+                .where(Shift.shift_id.in_(ids))
+                .returning(Shift.shift_id, Shift.location_id)
+                .execution_options(synchronize_session=False)
+            )
+            stage(db.session, [
+                make_record("shift", str(shift_id), "delete", {"status": "draft"}, location_id=location_id)
+                for shift_id, location_id in rows
+            ])
+
+        return self._in_batches(pick, apply)
+
+    def purge_idempotency_records(self, now: Optional[datetime] = None) -> int:
+        """Evict idempotency records past their TTL."""
+        now = now or datetime.utcnow()
+        pick = (
+            select(IdempotencyRecord.record_id)
+            .where(IdempotencyRecord.expires_at <= now)
+            .order_by(IdempotencyRecord.record_id)
+        )
+
+        def apply(ids: List[int]) -> None:
+            db.session.execute(
+                delete(IdempotencyRecord)
+                .where(IdempotencyRecord.record_id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+
+        return self._in_batches(pick, apply)
@@ -0,0 +1,75 @@
+# services/idempotency_service.py
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from extensions import db
+from models import IdempotencyRecord
+
+T = IdempotencyRecord.__table__
+
+
+class IdempotencyService:
+    """
+    Response cache behind the Idempotency-Key header.
+    Records are written on their own short transactions (db.engine), separate
+    from the request's db.session, so a claim is visible to concurrent
+    duplicates immediately and survives the handler's own rollbacks.
+    - claim: become the owner of (scope, key), or get the existing record.
+    - complete / release: store the final response, or drop the claim.
+    """
+
+    def __init__(self, ttl_seconds: int = 86400, lock_seconds: int = 60) -> None:
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.lock = timedelta(seconds=lock_seconds)
+
+    def claim(self, scope: str, key: str, fingerprint: str) -> Tuple[bool, Optional[object]]:
+        """Returns (owner, record). record is set only when someone else holds the key."""
+        now = datetime.utcnow()
+        fresh = dict(fingerprint=fingerprint, status="in_flight", response_status=None,
+                     response_body=None, content_type=None, locked_at=now, expires_at=now + self.ttl)
+        with db.engine.begin() as conn:
+            inserted = conn.execute(
+                insert(T).values(scope=scope, idem_key=key, **fresh)
+                .on_conflict_do_nothing(index_elements=[T.c.scope, T.c.idem_key])
+                .returning(T.c.record_id)
+            ).first()
+            if inserted:
+                return True, None
+
+            # Take over an expired record, or an in-flight one whose owner died
+            taken = conn.execute(
+                update(T)
+                .where(T.c.scope == scope, T.c.idem_key == key,
+                       or_(T.c.expires_at <= now,
+                           and_(T.c.status == "in_flight", T.c.locked_at <= now - self.lock)))
+                .values(**fresh)
+                .returning(T.c.record_id)
+            ).first()
+            if taken:
+                return True, None
+
+            return False, self.get(scope, key, conn)
+
+    @staticmethod
+    def get(scope: str, key: str, conn=None):
+        stmt = select(T).where(T.c.scope == scope, T.c.idem_key == key)
+        if conn is not None:
+            return conn.execute(stmt).first()
+        with db.engine.connect() as c:
+            return c.execute(stmt).first()
+
+    def complete(self, scope: str, key: str, status: int, body: str, content_type: Optional[str]) -> None:
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(T)
+                .where(T.c.scope == scope, T.c.idem_key == key, T.c.status == "in_flight")
+                .values(status="done", response_status=status, response_body=body,
+                        content_type=content_type, expires_at=datetime.utcnow() + self.ttl)
+            )
+
+    @staticmethod
+    def release(scope: str, key: str) -> None:
+        with db.engine.begin() as conn:
+            conn.execute(delete(T).where(T.c.scope == scope, T.c.idem_key == key, T.c.status == "in_flight"))
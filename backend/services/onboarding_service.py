@@ -1,5 +1,5 @@
 # services/onboarding_service.py
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Optional, Dict, Tuple
 
 from sqlalchemy.exc import IntegrityError
@@ -39,7 +39,8 @@ class OnboardingService:
             comp_id=comp_id,
             location_id=location_id,
             email=email.strip(),
-            status="pending"
+            status="pending",
+            expires_at=datetime.utcnow() + timedelta(days=ttl_days),
         )
         db.session.add(invite)
         db.session.commit()  # get form_id
@@ -85,6 +86,8 @@ class OnboardingService:
         invite = OnboardingInvite.query.get(form_id)
         if not invite or invite.status not in ("pending", "sent"):
             raise ValueError("Invite is not active")
+        if invite.expires_at and invite.expires_at <= datetime.utcnow():
+            raise ValueError("Invite has expired")
 
         if password != confirm_password:
             raise ValueError("password and confirm_password do not match")
@@ -0,0 +1,227 @@
+# services/schedule_service.py
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import Location, Shift, ShiftAssignment, ScheduleSnapshot
+from services.context_service import ContextService
+from services.audit_service import make_record, stage
+
+# ?fields= name -> column; "users" (assignee ids) needs the assignment join
+SHIFT_FIELDS = {
+    "location_id": Shift.location_id,
+    "start_time": Shift.start_time,
+    "end_time": Shift.end_time,
+    "status": Shift.status,
+}
+LIST_FIELDS = tuple(SHIFT_FIELDS) + ("users",)
+
+
+class ScheduleService:
+    """
+    Schedule publishing.
+    - publish_week: flips every draft shift of a location/week to "published" with one
+      set-based UPDATE and stores an immutable, versioned snapshot of the result.
+    - get_snapshot: employee read path; a published week is a single row fetch.
+    - diff: compares two snapshots so only changed shifts trigger notifications.
+    - list_shifts: live shift listing with sparse fieldsets (only requested columns are selected).
+    """
+
+    # ---------- Helpers ----------
+    @staticmethod
+    def week_bounds(day: date) -> Tuple[date, datetime, datetime]:
+        """Monday of `day`'s week plus the [start, end) datetime window."""
+        week_start = day - timedelta(days=day.weekday())
+        start = datetime.combine(week_start, time.min)
+        return week_start, start, start + timedelta(days=7)
+
+    @staticmethod
+    def _dump(obj: Dict) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    def _load_week(self, location_id: int, start: datetime, end: datetime) -> List[Dict]:
+        # One query: published shifts of the week, outer-joined with their assignees
+        rows = db.session.execute(
+            select(Shift.shift_id, Shift.start_time, Shift.end_time, ShiftAssignment.user_id)
+            .outerjoin(ShiftAssignment, ShiftAssignment.shift_id == Shift.shift_id)
+            .where(Shift.location_id == location_id,
+                   Shift.start_time >= start,
+                   Shift.start_time < end,
+                   Shift.status == "published")
+            .order_by(Shift.start_time, Shift.shift_id, ShiftAssignment.user_id)
+        ).all()
+
+        shifts: List[Dict] = []
+        for shift_id, start_time, end_time, user_id in rows:
+            if not shifts or shifts[-1]["id"] != shift_id:
+                shifts.append({
+                    "id": int(shift_id),
+                    "start": start_time.isoformat(),
+                    "end": end_time.isoformat(),
+                    "users": [],
+                })
+            if user_id is not None:
+                shifts[-1]["users"].append(int(user_id))
+        return shifts
+
+    @staticmethod
+    def list_shifts(location_id: int, start: datetime, end: datetime, fields: Sequence[str],
+                    statuses: Optional[Sequence[str]] = None) -> List[Dict]:
+        """
+        Shifts starting in [start, end), each as {"shift_id", <fields>...}.
+        Only the requested columns are put in the SELECT, and the assignment
+        join is made only when "users" is asked for.
+        """
+        unknown = set(fields) - set(LIST_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        cols = [f for f in fields if f in SHIFT_FIELDS]
+        with_users = "users" in fields
+
+        q = select(Shift.shift_id, *(SHIFT_FIELDS[f].label(f) for f in cols))
+        if with_users:
+            q = q.add_columns(ShiftAssignment.user_id).outerjoin(
+                ShiftAssignment, ShiftAssignment.shift_id == Shift.shift_id)
+        q = q.where(Shift.location_id == location_id, Shift.start_time >= start, Shift.start_time < end)
+        if statuses:
+            q = q.where(Shift.status.in_(statuses))
+        q = q.order_by(Shift.start_time, Shift.shift_id)
+
+        shifts: List[Dict] = []
+        for row in db.session.execute(q):
+            if with_users and shifts and shifts[-1]["shift_id"] == row[0]:
+                if row[-1] is not None:
+                    shifts[-1]["users"].append(int(row[-1]))
+                continue
+            item = {"shift_id": int(row[0])}
+            for i, f in enumerate(cols, 1):
+                value = row[i]
+                item[f] = value.isoformat() if isinstance(value, datetime) else value
+            if with_users:
+                item["users"] = [] if row[-1] is None else [int(row[-1])]
+            shifts.append(item)
+        return shifts
+
+    def get_snapshot(self, location_id: int, day: date,
+                     version: Optional[int] = None) -> Optional[ScheduleSnapshot]:
+        week_start, _, _ = self.week_bounds(day)
+        q = ScheduleSnapshot.query.filter_by(location_id=location_id, week_start=week_start)
+        if version is not None:
+            return q.filter_by(version=version).first()
+        return q.order_by(ScheduleSnapshot.version.desc()).first()
+
+    @staticmethod
+    def diff(previous: List[Dict], current: List[Dict]) -> Dict:
+        """Shift-level diff between two snapshot shift lists, plus the users to notify."""
+        prev = {s["id"]: s for s in previous}
+        curr = {s["id"]: s for s in current}
+
+        added = sorted(curr.keys() - prev.keys())
+        removed = sorted(prev.keys() - curr.keys())
+        changed = sorted(
+            sid for sid in curr.keys() & prev.keys()
+            if curr[sid] != prev[sid]
+        )
+
+        notify = set()
+        for sid in added:
+            notify.update(curr[sid]["users"])
+        for sid in removed:
+            notify.update(prev[sid]["users"])
+        for sid in changed:
+            notify.update(curr[sid]["users"])
+            notify.update(prev[sid]["users"])
+
+        return {
+            "added": added,
+            "removed": removed,
+            "changed": changed,
+            "notify_user_ids": sorted(notify),
+        }
+
+    # ---------- Manager side ----------
+    def publish_week(self, location_id: int, day: date,
+                     published_by: Optional[int] = None) -> Tuple[ScheduleSnapshot, Dict, bool]:
+        """
+        Publish a location's week atomically.
+        Returns (snapshot, diff, created). When nothing changed since the last
+        publish, the existing snapshot is returned and created is False.
+        """
+        week_start, start, end = self.week_bounds(day)
+
+        try:
+            # Row lock on the location serializes concurrent publishes of its schedule
+            loc = db.session.execute(
+                select(Location.loc_id).where(Location.loc_id == location_id).with_for_update()
+            ).first()
+            if not loc:
+                raise ValueError("Location not found")
+
+            result = db.session.execute(
+                update(Shift)
+                .where(Shift.location_id == location_id,
+                       Shift.start_time >= start,
+                       Shift.start_time < end,
+                       Shift.status == "draft")
+                .values(status="published")
+                .returning(Shift.shift_id)
+                .execution_options(synchronize_session=False)
+            )
+            flipped_ids = result.scalars().all()
+            flipped = len(flipped_ids)
+            stage(db.session, [
+                make_record("shift", str(sid), "update", {"status": ["draft", "published"]}, location_id=location_id)
+                for sid in flipped_ids
+            ])
+
+            shifts = self._load_week(location_id, start, end)
+            previous = (
+                ScheduleSnapshot.query
+                .filter_by(location_id=location_id, week_start=week_start)
+                .order_by(ScheduleSnapshot.version.desc())
+                .first()
+            )
+            prev_shifts = json.loads(previous.payload)["shifts"] if previous else []
+            changes = self.diff(prev_shifts, shifts)
+            changes["drafts_published"] = flipped
+
+            # The bulk UPDATE bypasses session events; drop affected users' cached context
+            ContextService.invalidate(changes["notify_user_ids"])
+
+            if previous and not (changes["added"] or changes["removed"] or changes["changed"]):
+                db.session.commit()
+                return previous, changes, False
+            if not previous and not shifts:
+                raise ValueError("No shifts to publish for this week")
+
+            version = (previous.version if previous else 0) + 1
+            published_at = datetime.utcnow()
+            snapshot = ScheduleSnapshot(
+                location_id=location_id,
+                week_start=week_start,
+                version=version,
+                shift_count=len(shifts),
+                payload=self._dump({
+                    "location_id": location_id,
+                    "week_start": week_start.isoformat(),
+                    "version": version,
+                    "published_at": published_at.isoformat(),
+                    "shifts": shifts,
+                }),
+                published_by=published_by,
+                published_at=published_at,
+            )
+            db.session.add(snapshot)
+            db.session.commit()
+        except ValueError:
+            db.session.rollback()
+            raise
+        except IntegrityError:
+            db.session.rollback()
+            raise ValueError("Schedule was published concurrently; retry")
+
+        return snapshot, changes, True
+
@@ -0,0 +1,194 @@
+# services/solver.py
+"""
+Shift-assignment solver kernels. Pure NumPy, no Flask/DB imports: payloads
+and results are dicts of small arrays so they pickle compactly when sent
+across a process pool, and importing this module in a child is cheap.
+
+Payload (one per location; times are minutes since the epoch, *_tod minutes
+since midnight, dow 0=mon):
+    location_id
+    shift_ids, starts, ends, dows, start_tod             (per open shift)
+    user_ids                                             (eligible employees)
+    av_user, av_dow, av_start, av_end                    (availability rows; av_user indexes user_ids)
+    busy_user, busy_start, busy_end                      (existing commitments; busy_user indexes user_ids)
+    max_minutes, alternatives
+    user_max                                             (optional per-user cap; see split_shared_hours)
+"""
+import bisect
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _available(p: Dict) -> np.ndarray:
+    """(S, U) bool: availability covers the whole shift on its weekday."""
+    S, U = len(p["starts"]), len(p["user_ids"])
+    end_tod = p["start_tod"] + (p["ends"] - p["starts"])
+    cover = ((p["av_dow"][None, :] == p["dows"][:, None])
+             & (p["av_start"][None, :] <= p["start_tod"][:, None])
+             & (p["av_end"][None, :] >= end_tod[:, None]))  # (S, A)
+    hits = np.zeros((U, S), np.int32)
+    np.add.at(hits, p["av_user"], cover.T)
+    return hits.T > 0
+
+
+def solve_location(p: Dict) -> Dict:
+    """Greedy least-loaded assignment of one employee per open shift, in start order."""
+    starts, ends = p["starts"], p["ends"]
+    user_ids = p["user_ids"]
+    k = p.get("alternatives", 3)
+    S, U = len(starts), len(user_ids)
+
+    empty = {
+        "location_id": p["location_id"],
+        "shift_ids": np.empty(0, np.int64), "user_ids": np.empty(0, np.int64),
+        "starts": np.empty(0, np.int64), "ends": np.empty(0, np.int64),
+        "alts": np.empty((0, k), np.int64),
+    }
+    if S == 0 or U == 0:
+        return empty
+
+    dur = ends - starts
+    eligible = _available(p)
+
+    # Existing commitments: exclude overlapping shifts and count their minutes
+    load = np.zeros(U, np.int64)
+    if len(p["busy_user"]):
+        clash = (p["busy_start"][None, :] < ends[:, None]) & (p["busy_end"][None, :] > starts[:, None])
+        clashes = np.zeros((U, S), np.int32)
+        np.add.at(clashes, p["busy_user"], clash.T)
+        eligible &= clashes.T == 0
+        np.add.at(load, p["busy_user"], p["busy_end"] - p["busy_start"])
+
+    last_end = np.full(U, np.iinfo(np.int64).min, np.int64)
+    max_minutes = p.get("user_max", p["max_minutes"])
+
+    picked_shift: List[int] = []
+    picked_user: List[int] = []
+    alts = np.full((S, k), -1, np.int64)
+    for s in np.argsort(starts, kind="stable"):
+        ok = eligible[s] & (last_end <= starts[s]) & (load + dur[s] <= max_minutes)
+        cand = np.flatnonzero(ok)
+        if cand.size == 0:
+            continue
+        ranked = cand[np.argsort(load[cand], kind="stable")]
+        u = ranked[0]
+        load[u] += dur[s]
+        last_end[u] = max(last_end[u], ends[s])
+        backups = user_ids[ranked[1:k + 1]]
+        alts[len(picked_shift), :backups.size] = backups
+        picked_shift.append(s)
+        picked_user.append(u)
+
+    if not picked_shift:
+        return empty
+    idx = np.array(picked_shift, np.int64)
+    return {
+        "location_id": p["location_id"],
+        "shift_ids": p["shift_ids"][idx],
+        "user_ids": user_ids[np.array(picked_user, np.int64)],
+        "starts": starts[idx],
+        "ends": ends[idx],
+        "alts": alts[:len(picked_shift)],
+    }
+
+
+def split_shared_hours(payloads: List[Dict]) -> None:
+    """
+    Give employees who appear in several subproblems (floaters, multi-location
+    employments) a share of their remaining weekly hours in each, instead of
+    the full allowance everywhere. The share follows the shift minutes they
+    are available for in each subproblem, so a floater available at one store
+    keeps all their hours there; each share is at least their longest shift
+    there, so a small share still allows one shift. Existing commitments
+    count in full. Sets p["user_max"] in place.
+    """
+    eligible_minutes, longest = [], []
+    total: Dict[int, int] = {}
+    for p in payloads:
+        U = len(p["user_ids"])
+        if len(p["starts"]) and U:
+            ok = _available(p)
+            dur = (p["ends"] - p["starts"])[:, None]
+            minutes = (ok * dur).sum(axis=0).astype(np.int64)
+            top = np.where(ok, dur, 0).max(axis=0).astype(np.int64)
+        else:
+            minutes, top = np.zeros(U, np.int64), np.zeros(U, np.int64)
+        eligible_minutes.append(minutes)
+        longest.append(top)
+        for u, m in zip(p["user_ids"].tolist(), minutes.tolist()):
+            total[u] = total.get(u, 0) + m
+
+    for p, minutes, top in zip(payloads, eligible_minutes, longest):
+        user_ids = p["user_ids"]
+        busy = np.zeros(len(user_ids), np.int64)
+        if len(p["busy_user"]):
+            np.add.at(busy, p["busy_user"], p["busy_end"] - p["busy_start"])
+        remaining = np.maximum(p["max_minutes"] - busy, 0)
+        totals = np.array([total[u] for u in user_ids.tolist()], np.int64)
+        share = np.where(totals > 0, remaining * minutes // np.maximum(totals, 1), remaining)
+        p["user_max"] = busy + np.minimum(np.maximum(share, top), remaining)
+
+
+def solve_all(payloads: List[Dict], workers: int = 1, mp_context: str = "spawn") -> List[Dict]:
+    """Solve independent location subproblems, in parallel when workers > 1."""
+    if workers <= 1 or len(payloads) <= 1:
+        return [solve_location(p) for p in payloads]
+
+    # Largest subproblems first so the pool's tail is short
+    order = sorted(range(len(payloads)), key=lambda i: -len(payloads[i]["shift_ids"]) * len(payloads[i]["user_ids"]))
+    results: List[Optional[Dict]] = [None] * len(payloads)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context(mp_context)) as pool:
+        futures = {i: pool.submit(solve_location, payloads[i]) for i in order}
+        for i, fut in futures.items():
+            results[i] = fut.result()
+    return results
+
+
+def reconcile(results: List[Dict], busy: Dict[int, List[Tuple[int, int]]],
+              max_minutes: int) -> Tuple[List[Tuple[int, int]], List[int], int]:
+    """
+    Merge per-location results into one consistent company schedule.
+    Employees who float between locations may have been given overlapping
+    shifts, or too many hours in total, by independent subproblems. Proposals
+    are replayed in start order against one global per-employee timeline;
+    a conflicting proposal falls back to that shift's ranked alternatives.
+    Returns (assignments [(shift_id, user_id)], unfilled shift_ids, reassigned count).
+    """
+    timeline: Dict[int, List[Tuple[int, int]]] = {u: sorted(iv) for u, iv in busy.items()}
+    load: Dict[int, int] = {u: sum(e - s for s, e in iv) for u, iv in timeline.items()}
+
+    def fits(u: int, s: int, e: int) -> bool:
+        if load.get(u, 0) + (e - s) > max_minutes:
+            return False
+        iv = timeline.get(u, [])
+        i = bisect.bisect_left(iv, (s, e))
+        if i > 0 and iv[i - 1][1] > s:
+            return False
+        return not (i < len(iv) and iv[i][0] < e)
+
+    proposals = []
+    for r in results:
+        for j in range(len(r["shift_ids"])):
+            proposals.append((int(r["starts"][j]), int(r["ends"][j]), int(r["shift_ids"][j]),
+                              int(r["user_ids"][j]), r["alts"][j]))
+    proposals.sort(key=lambda t: (t[0], t[2]))
+
+    assignments: List[Tuple[int, int]] = []
+    unfilled: List[int] = []
+    reassigned = 0
+    for s, e, shift_id, user_id, alts in proposals:
+        for cand in [user_id] + [int(a) for a in alts if a >= 0]:
+            if fits(cand, s, e):
+                bisect.insort(timeline.setdefault(cand, []), (s, e))
+                load[cand] = load.get(cand, 0) + (e - s)
+                assignments.append((shift_id, cand))
+                reassigned += cand != user_id
+                break
+        else:
+            unfilled.append(shift_id)
+    return assignments, unfilled, reassigned
@@ -0,0 +1,59 @@
+# services/test_solver.py -- python -m pytest services/test_solver.py
+import numpy as np
+
+from services.solver import MINUTES_PER_DAY, solve_location, split_shared_hours
+
+MONDAY = 19_996 * MINUTES_PER_DAY  # epoch day 19996 is a monday (day 0 was a thursday)
+EMPTY = np.empty(0, np.int64)
+
+
+def _payload(location_id, starts, durations, user_ids, availability):
+    """availability: [(user index, dow, start_tod, end_tod)]"""
+    starts = np.array(starts, np.int64)
+    av = np.array(availability, np.int64).reshape(-1, 4)
+    return {
+        "location_id": location_id,
+        "shift_ids": np.arange(location_id * 1000, location_id * 1000 + starts.size, dtype=np.int64),
+        "starts": starts,
+        "ends": starts + np.array(durations, np.int64),
+        "dows": ((starts // MINUTES_PER_DAY) + 3) % 7,
+        "start_tod": starts % MINUTES_PER_DAY,
+        "user_ids": np.array(user_ids, np.int64),
+        "av_user": av[:, 0], "av_dow": av[:, 1], "av_start": av[:, 2], "av_end": av[:, 3],
+        "busy_user": EMPTY, "busy_start": EMPTY, "busy_end": EMPTY,
+        "max_minutes": 40 * 60,
+        "alternatives": 3,
+    }
+
+
+def test_monday_constant():
+    assert ((MONDAY // MINUTES_PER_DAY) + 3) % 7 == 0
+
+
+def test_floater_keeps_hours_where_available():
+    floater = 99
+    nine_am = MONDAY + 9 * 60
+    # Available (and needed) only at location 0; merely listed at 19 others
+    payloads = [_payload(0, [nine_am], [480], [floater], [(0, 0, 8 * 60, 18 * 60)])]
+    for loc in range(1, 20):
+        payloads.append(_payload(loc, [nine_am], [480], [loc, floater], [(0, 0, 8 * 60, 18 * 60)]))
+
+    split_shared_hours(payloads)
+
+    assert payloads[0]["user_max"][0] == 40 * 60
+    result = solve_location(payloads[0])
+    assert result["user_ids"].tolist() == [floater]
+
+
+def test_shared_hours_split_by_eligible_minutes():
+    user = 7
+    shifts = [MONDAY + d * MINUTES_PER_DAY + 9 * 60 for d in range(5)]
+    all_week = [(0, d, 0, MINUTES_PER_DAY) for d in range(7)]
+    a = _payload(0, shifts, [480] * 5, [user], all_week)
+    b = _payload(1, shifts[:1], [480], [user], all_week)
+
+    split_shared_hours([a, b])
+
+    # 2400 of 2880 eligible minutes at a, 480 at b; every share fits at least one shift
+    assert a["user_max"][0] == 2000
+    assert b["user_max"][0] == 480
@@ -0,0 +1,28 @@
+from typing import Optional
+from extensions import db
+from models import Employment, Location
+
+MANAGER_POSITIONS = ("owner", "manager", "admin")
+
+
+def company_position(user_id: int, comp_id: int) -> Optional[str]:
+    """Position of the caller's active employment in a company, or None."""
+    emp = Employment.query.filter_by(user_id=user_id, comp_id=comp_id, status="active").first()
+    return emp.position if emp else None
+
+
+def location_position(user_id: int, location_id: int) -> Optional[str]:
+    """Same as company_position, resolved through the location's company (one query)."""
+    row = (
+        db.session.query(Employment.position)
+        .join(Location, Location.comp_id == Employment.comp_id)
+        .filter(Location.loc_id == location_id,
+                Employment.user_id == user_id,
+                Employment.status == "active")
+        .first()
+    )
+    return row[0] if row else None
+
+
+def is_manager(position: Optional[str]) -> bool:
+    return bool(position) and position.lower() in MANAGER_POSITIONS
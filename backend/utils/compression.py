@@ -0,0 +1,62 @@
+import gzip
+from typing import Dict
+
+from flask import Flask, Response, request
+
+COMPRESSIBLE = ("application/json", "text/", "application/javascript")
+
+
+def _accepts(header: str) -> Dict[str, float]:
+    """Accept-Encoding -> {coding: q}."""
+    out = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        out[coding.strip().lower()] = q
+    return out
+
+
+def _wants_gzip(header: str) -> bool:
+    accepted = _accepts(header)
+    q = accepted.get("gzip", accepted.get("x-gzip", accepted.get("*", 0.0)))
+    return q > 0
+
+
+def init_compression(app: Flask) -> None:
+    """
+    gzip response bodies when the client sends Accept-Encoding: gzip and the
+    body is at least COMPRESS_MIN_BYTES. Streamed/passthrough responses (file
+    downloads, ranges) and bodies that already carry an encoding are left alone.
+    """
+    if not app.config["COMPRESS_ENABLED"]:
+        return
+    min_bytes = app.config["COMPRESS_MIN_BYTES"]
+    level = app.config["COMPRESS_LEVEL"]
+
+    @app.after_request
+    def compress(response: Response) -> Response:
+        response.vary.add("Accept-Encoding")
+        if (response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or "Content-Encoding" in response.headers
+                or not (response.mimetype or "").startswith(COMPRESSIBLE)
+                or not _wants_gzip(request.headers.get("Accept-Encoding", ""))):
+            return response
+
+        data = response.get_data()
+        if len(data) < min_bytes:
+            return response
+        response.set_data(gzip.compress(data, compresslevel=level, mtime=0))
+        response.headers["Content-Encoding"] = "gzip"
+        if response.headers.get("ETag"):
+            response.set_etag(response.get_etag()[0] + "-gzip", weak=True)
+        return response
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from flask import Flask
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+POOL_MODES = ("direct", "pgbouncer")
+
+
+def engine_options(config) -> Dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings.
+
+    direct:    we talk to Postgres; statement_timeout is set per connection
+               through the startup `options` parameter.
+    pgbouncer: transaction pooling. Server connections are shared between
+               clients per transaction, so nothing session-scoped may be set:
+               no startup options (set statement_timeout on the role instead)
+               and no server-side prepared statements.
+    """
+    mode = config["DB_POOL_MODE"]
+    if mode not in POOL_MODES:
+        raise ValueError(f"DB_POOL_MODE must be one of {POOL_MODES}")
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() == "sqlite":
+        return {}
+
+    connect_args: Dict = {"connect_timeout": config["DB_CONNECT_TIMEOUT"]}
+    if mode == "direct" and config["DB_STATEMENT_TIMEOUT_MS"]:
+        connect_args["options"] = f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"
+    if mode == "pgbouncer":
+        # psycopg2 never prepares server-side; psycopg 3 and asyncpg do unless told not to
+        driver = url.get_driver_name()
+        if driver == "psycopg":
+            connect_args["prepare_threshold"] = None
+        elif driver == "asyncpg":
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+
+    return {
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+        "connect_args": connect_args,
+    }
+
+
+# ---------- Pool statistics ----------
+class PoolStats:
+    """Per-process pool event counters (new connections, invalidations, checkouts)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters = {"connects": 0, "checkouts": 0, "invalidated": 0}
+
+    def reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys(self.counters, 0)
+
+    def _bump(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def on_connect(self, dbapi_conn, record) -> None:
+        self._bump("connects")
+
+    def on_checkout(self, dbapi_conn, record, proxy) -> None:
+        self._bump("checkouts")
+
+    def on_invalidate(self, dbapi_conn, record, exc) -> None:
+        self._bump("invalidated")
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return dict(self.counters)
+
+
+def pool_status(engine) -> Dict:
+    """Occupancy of the engine's pool; used by /healthz/db and by load shedding."""
+    pool = engine.pool
+    status: Dict = {"class": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        status["checked_out"] = pool.checkedout()
+    if hasattr(pool, "checkedin"):
+        status["idle"] = pool.checkedin()
+    if hasattr(pool, "size"):
+        status["size"] = pool.size()
+        status["overflow"] = pool.overflow() if hasattr(pool, "overflow") else 0
+        max_overflow = getattr(pool, "_max_overflow", 0)  # QueuePool has no public accessor
+        status["capacity"] = pool.size() + max_overflow if max_overflow >= 0 else None  # None: unbounded
+    return status
+
+
+def check_db(engine) -> Dict:
+    """Time one pool checkout and one round trip (SELECT 1)."""
+    t0 = time.perf_counter()
+    with engine.connect() as conn:
+        t1 = time.perf_counter()
+        conn.execute(text("SELECT 1"))
+        t2 = time.perf_counter()
+    return {"checkout_ms": round((t1 - t0) * 1000, 2), "query_ms": round((t2 - t1) * 1000, 2)}
+
+
+def warm_pool(app: Flask, n: Optional[int] = None) -> int:
+    """
+    Open up to `n` (default DB_POOL_MIN) connections and return them to the
+    pool, so a fresh worker's first requests don't each pay a TCP + auth
+    handshake at once. Failures are logged, never raised: a worker must
+    still boot while the database is unreachable.
+    """
+    n = app.config["DB_POOL_MIN"] if n is None else n
+    with app.app_context():
+        engine = db.engine
+        if hasattr(engine.pool, "size"):
+            n = min(n, engine.pool.size())
+        conns = []
+        try:
+            for _ in range(n):
+                conns.append(engine.connect())
+        except Exception:
+            logger.exception("db pool warm-up stopped after %d connections", len(conns))
+        finally:
+            for conn in conns:
+                conn.close()
+        return len(conns)
+
+
+def init_db_pool(app: Flask) -> None:
+    """Engine options from config. Must run before db.init_app, which builds the engine."""
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **engine_options(app.config),
+        **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),  # explicit overrides win
+    }
+
+
+def track_pool_events(app: Flask) -> None:
+    """Count pool events on this app's engine (listeners survive engine.dispose)."""
+    stats = PoolStats()
+    app.extensions["db_pool_stats"] = stats
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "connect", stats.on_connect)
+    event.listen(engine, "checkout", stats.on_checkout)
+    event.listen(engine, "invalidate", stats.on_invalidate)
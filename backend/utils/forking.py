@@ -0,0 +1,33 @@
+import os
+import weakref
+from flask import Flask
+from extensions import db
+
+# Apps built in this process; the at-fork handler is registered once (below),
+# since os.register_at_fork handlers can never be removed
+_apps: "weakref.WeakSet[Flask]" = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for app in list(_apps):
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+        for name in ("limiter", "db_pool_stats"):
+            ext = app.extensions.get(name)
+            if ext is not None:
+                ext.reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def init_fork_safety(app: Flask) -> None:
+    """
+    Make an app built in a pre-forking master (gunicorn --preload) safe to
+    inherit: after fork, each child drops the pooled DB connections it
+    copied from the parent (without closing the parent's sockets) and
+    resets other per-process state, so workers never share a connection.
+    """
+    _apps.add(app)
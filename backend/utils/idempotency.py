@@ -0,0 +1,105 @@
+import base64
+import hashlib
+import hmac
+import time
+from functools import wraps
+
+from cryptography.fernet import Fernet, InvalidToken
+from flask import Response, current_app, jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from services.idempotency_service import IdempotencyService
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def _caller():
+    # Only set on routes that already verified a JWT
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        return None
+
+
+# Bodies include passwords and responses include JWTs, so neither is stored in
+# the clear: the fingerprint is an HMAC, the response is encrypted. Both keys
+# derive from the app secret, so DB read access alone reveals nothing.
+def _derive(label: str, *parts: str) -> bytes:
+    secret = current_app.config["JWT_SECRET_KEY"].encode()
+    return hmac.new(secret, "\x00".join((label,) + parts).encode(), hashlib.sha256).digest()
+
+
+def _fingerprint(body: bytes) -> str:
+    return hmac.new(_derive("idempotency-fingerprint"), body, hashlib.sha256).hexdigest()
+
+
+def _cipher(scope: str, key: str) -> Fernet:
+    return Fernet(base64.urlsafe_b64encode(_derive("idempotency-response", scope, key)))
+
+
+def _replay(record, cipher: Fernet) -> Response:
+    try:
+        body = cipher.decrypt(record.response_body.encode())
+    except (InvalidToken, AttributeError):
+        # Stored under another secret (rotated); we can't replay and must not re-run
+        return jsonify({"error": "Stored response for this Idempotency-Key is unavailable"}), 409
+    resp = Response(body, status=record.response_status, content_type=record.content_type)
+    resp.headers["Idempotent-Replayed"] = "true"
+    return resp
+
+
+def idempotent(fn):
+    """
+    Honour an optional Idempotency-Key header on a write endpoint.
+    The first request with a key runs the handler and stores its response;
+    replays return the stored response without re-running it, and duplicates
+    arriving while the first is still running wait for its result. Reusing a
+    key with a different body is rejected. 5xx responses are not stored.
+    Place below @jwt_required() so keys are scoped per caller.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (request.headers.get(HEADER) or "").strip()
+        if not key:
+            return fn(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({"error": f"{HEADER} too long"}), 400
+
+        cfg = current_app.config
+        svc = IdempotencyService(ttl_seconds=cfg["IDEMPOTENCY_TTL_SECONDS"],
+                                 lock_seconds=cfg["IDEMPOTENCY_LOCK_SECONDS"])
+        caller = _caller()
+        scope = f"{request.method} {request.path}" + (f" user:{caller}" if caller else "")
+        fingerprint = _fingerprint(request.get_data(cache=True))
+        cipher = _cipher(scope, key)
+
+        deadline = time.monotonic() + cfg["IDEMPOTENCY_WAIT_SECONDS"]
+        delay = 0.01
+        while True:
+            owner, record = svc.claim(scope, key, fingerprint)
+            if owner:
+                break
+            if record is not None and record.fingerprint != fingerprint:
+                return jsonify({"error": f"{HEADER} reused with a different request body"}), 422
+            if record is not None and record.status == "done":
+                return _replay(record, cipher)
+            # In flight elsewhere: wait for it, then re-check (it may finish or be released)
+            if time.monotonic() >= deadline:
+                return jsonify({"error": "A request with this Idempotency-Key is still in progress"}), 409
+            time.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+        try:
+            resp = make_response(fn(*args, **kwargs))
+        except Exception:
+            svc.release(scope, key)
+            raise
+
+        if resp.status_code >= 500 or resp.is_streamed:
+            svc.release(scope, key)
+        else:
+            svc.complete(scope, key, resp.status_code,
+                         cipher.encrypt(resp.get_data()).decode(), resp.content_type)
+        return resp
+
+    return wrapper
@@ -0,0 +1,43 @@
+import importlib
+import threading
+from typing import Any, List
+
+
+class Lazy:
+    """
+    Proxy for a module-level singleton (controllers in routes/*) that imports
+    and builds its target on first attribute access, e.g.
+
+        ctrl = Lazy("controllers.onboarding_controller:OnboardingController")
+
+    Importing a routes module therefore costs nothing beyond the Blueprint;
+    controllers, services and their heavy imports load on the first request,
+    or all at once in a preloading master via Lazy.resolve_all().
+    """
+
+    _instances: List["Lazy"] = []
+
+    def __init__(self, target: str) -> None:
+        self._target = target
+        self._obj = None
+        self._lock = threading.Lock()
+        Lazy._instances.append(self)
+
+    def _resolve(self) -> Any:
+        if self._obj is None:
+            with self._lock:
+                if self._obj is None:
+                    module, _, name = self._target.partition(":")
+                    self._obj = getattr(importlib.import_module(module), name)()
+        return self._obj
+
+    def __getattr__(self, item: str) -> Any:
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self._resolve(), item)
+
+    @classmethod
+    def resolve_all(cls) -> int:
+        for lazy in cls._instances:
+            lazy._resolve()
+        return len(cls._instances)
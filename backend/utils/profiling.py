@@ -0,0 +1,172 @@
+import cProfile
+import hmac
+import io
+import json
+import os
+import pstats
+import random
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PROFILE_HEADER = "X-Profile"
+MAX_SQL_STATEMENTS = 500
+MAX_SQL_LENGTH = 2000
+TOP_FUNCTIONS = 40
+
+
+def token_matches(app: Flask, supplied: Optional[str], setting: str = "PROFILE_TOKEN") -> bool:
+    token = app.config.get(setting)
+    # compare bytes: compare_digest raises TypeError on non-ASCII str
+    return bool(token and supplied) and hmac.compare_digest(token.encode(), supplied.encode())
+
+
+# ---------- SQL capture ----------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and g.get("_profile") is not None:
+        context._profile_t0 = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    t0 = getattr(context, "_profile_t0", None)
+    if t0 is None or not has_request_context():
+        return
+    sql = g.get("_profile_sql")
+    if sql is not None and len(sql) < MAX_SQL_STATEMENTS:
+        sql.append({
+            "statement": statement[:MAX_SQL_LENGTH],
+            "ms": round((time.perf_counter() - t0) * 1000, 3),
+            "executemany": bool(executemany),
+        })
+
+
+# ---------- Ring buffer on disk ----------
+class ProfileStore:
+    """Keeps the newest `max_files` profiles: <id>.json (summary) + <id>.prof (pstats dump)."""
+
+    def __init__(self, directory: str, max_files: int) -> None:
+        self.directory = directory
+        self.max_files = max_files
+
+    def _path(self, profile_id: str, ext: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{ext}")
+
+    def save(self, profile_id: str, summary: Dict, profiler: cProfile.Profile) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump_stats(self._path(profile_id, "prof"))
+        with open(self._path(profile_id, "json"), "w") as fh:
+            json.dump(summary, fh, separators=(",", ":"))
+        self._prune()
+
+    def _prune(self) -> None:
+        summaries = sorted(f for f in os.listdir(self.directory) if f.endswith(".json"))
+        for name in summaries[:max(0, len(summaries) - self.max_files)]:
+            for ext in ("json", "prof"):
+                try:
+                    os.unlink(self._path(name[:-5], ext))
+                except FileNotFoundError:
+                    pass
+
+    def list(self) -> List[Dict]:
+        if not os.path.isdir(self.directory):
+            return []
+        out = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if not name.endswith(".json"):
+                continue
+            summary = self.get(name[:-5])
+            if summary:
+                summary.pop("top", None)
+                summary.pop("sql", None)
+                out.append(summary)
+        return out
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(profile_id, "json")) as fh:
+                return json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def prof_path(self, profile_id: str) -> Optional[str]:
+        path = self._path(profile_id, "prof")
+        return path if os.path.exists(path) else None
+
+
+def store_for(app: Flask) -> ProfileStore:
+    return ProfileStore(app.config["PROFILE_DIR"], app.config["PROFILE_MAX_FILES"])
+
+
+# ---------- Middleware ----------
+def init_profiling(app: Flask) -> None:
+    """
+    Opt-in per-request profiling. A request is profiled when it carries
+    X-Profile: <PROFILE_TOKEN>, or is picked at PROFILE_SAMPLE_RATE. With
+    neither configured no hooks or SQL listeners are installed at all.
+    """
+    rate = app.config["PROFILE_SAMPLE_RATE"]
+    if not app.config.get("PROFILE_TOKEN") and rate <= 0:
+        return
+
+    store = store_for(app)
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def _start_profile():
+        forced = token_matches(app, request.headers.get(PROFILE_HEADER))
+        if not forced and not (rate > 0 and random.random() < rate):
+            return
+        g._profile_sql = []
+        g._profile_t0 = time.perf_counter()
+        g._profile_reason = "header" if forced else "sampled"
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler is already active on this thread
+            return
+        g._profile = profiler
+
+    @app.after_request
+    def _finish_profile(response):
+        profiler = g.pop("_profile", None)
+        if profiler is None:
+            return response
+        profiler.disable()
+        elapsed_ms = (time.perf_counter() - g._profile_t0) * 1000
+
+        top = io.StringIO()
+        pstats.Stats(profiler, stream=top).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        sql = g.pop("_profile_sql", [])
+
+        # Sortable id: newest last in directory order
+        profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+        store.save(profile_id, {
+            "id": profile_id,
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "reason": g._profile_reason,
+            "ms": round(elapsed_ms, 3),
+            "sql_count": len(sql),
+            "sql_ms": round(sum(q["ms"] for q in sql), 3),
+            "captured_at": datetime.utcnow().isoformat(),
+            "sql": sql,
+            "top": top.getvalue(),
+        }, profiler)
+        response.headers["X-Profile-Id"] = profile_id
+        return response
+
+    @app.teardown_request
+    def _abort_profile(exc):
+        # after_request is skipped on unhandled errors; never leave a profiler running
+        profiler = g.pop("_profile", None)
+        if profiler is not None:
+            profiler.disable()
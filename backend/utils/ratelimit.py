@@ -0,0 +1,356 @@
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask, current_app, g, jsonify, request
+from flask_jwt_extended import decode_token
+from werkzeug.middleware.proxy_fix import ProxyFix
+from extensions import db
+from utils.dbpool import pool_status
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- Bucket stores ----------
+class MemoryBucketStore:
+    """Token buckets in this process. Bounded: least recently used keys are evicted."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()  # key -> (tokens, ts, burst)
+
+    def take(self, key: str, rate: float, burst: float) -> Tuple[bool, float, float]:
+        """Take one token. Returns (allowed, tokens_left, retry_after_seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            b = self._buckets.get(key)
+            tokens = burst if b is None else min(burst, b[0] + (now - b[1]) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, burst)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, tokens, 0.0 if allowed else (1 - tokens) / rate
+
+    def peek(self, key: str, rate: float, burst: float) -> float:
+        """Tokens currently available, without taking one."""
+        now = time.monotonic()
+        with self._lock:
+            b = self._buckets.get(key)
+        return burst if b is None else min(burst, b[0] + (now - b[1]) * rate)
+
+    def reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def state(self, limit: int) -> Tuple[int, List[Dict]]:
+        with self._lock:
+            items = list(self._buckets.items())
+        lowest = sorted(items, key=lambda kv: kv[1][0] / kv[1][2])[:limit]
+        return len(items), [{"key": k, "tokens": round(t, 3), "burst": burst} for k, (t, _, burst) in lowest]
+
+
+class SqliteBucketStore:
+    """
+    Local stand-in for a shared store (e.g. Redis): one SQLite file shared by
+    every worker process on the host. Each take is a short IMMEDIATE transaction.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS bucket (key TEXT PRIMARY KEY, tokens REAL, ts REAL, burst REAL)")
+
+    def reset_after_fork(self) -> None:
+        # SQLite connections must not cross fork()
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, rate: float, burst: float) -> Tuple[bool, float, float]:
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, ts FROM bucket WHERE key = ?", (key,)).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + max(0.0, now - row[1]) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                "INSERT INTO bucket (key, tokens, ts, burst) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, ts = excluded.ts, burst = excluded.burst",
+                (key, tokens, now, burst),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, tokens, 0.0 if allowed else (1 - tokens) / rate
+
+    def peek(self, key: str, rate: float, burst: float) -> float:
+        row = self._conn().execute("SELECT tokens, ts FROM bucket WHERE key = ?", (key,)).fetchone()
+        return burst if row is None else min(burst, row[0] + max(0.0, time.time() - row[1]) * rate)
+
+    def state(self, limit: int) -> Tuple[int, List[Dict]]:
+        conn = self._conn()
+        total = conn.execute("SELECT count(*) FROM bucket").fetchone()[0]
+        rows = conn.execute(
+            "SELECT key, tokens, burst FROM bucket ORDER BY tokens / burst LIMIT ?", (limit,)
+        ).fetchall()
+        return total, [{"key": k, "tokens": round(t, 3), "burst": b} for k, t, b in rows]
+
+
+# ---------- Key resolution ----------
+def _client_ip() -> str:
+    # remote_addr only: X-Forwarded-For is client-controlled unless ProxyFix
+    # (TRUSTED_PROXY_COUNT) has already rewritten remote_addr from it
+    return request.remote_addr or "unknown"
+
+
+def _claims(token: str) -> Dict:
+    try:
+        data = decode_token(token)
+    except Exception:
+        return {}
+    return data.get("claims") or data
+
+
+def _tenant() -> Optional[str]:
+    """
+    The company a request acts for: from a (signed) onboarding token, or the
+    comp_id an authenticated caller names, if the caller is employed there.
+    Other authenticated calls fall back to the user. Anonymous requests have
+    no tenant: a key taken from the body (e.g. a login email) would let
+    anyone drain someone else's bucket.
+    """
+    body = request.get_json(silent=True) or {}
+    invite = request.args.get("token") or body.get("token")
+    if invite:
+        comp_id = _claims(invite).get("comp_id")
+        if comp_id:
+            return f"comp:{comp_id}"
+
+    auth = request.headers.get("Authorization", "")
+    sub = _claims(auth[7:]).get("sub") if auth.startswith("Bearer ") else None
+    if not sub:
+        return None
+    comp_id = request.args.get("comp_id") or body.get("comp_id")
+    if comp_id:
+        from utils.authz import company_position  # models import; keep module import light
+        try:
+            if company_position(int(sub), int(comp_id)):
+                return f"comp:{int(comp_id)}"
+        except (TypeError, ValueError):
+            pass
+    return f"user:{sub}"
+
+
+def _login_account() -> Optional[str]:
+    email = (request.get_json(silent=True) or {}).get("email")
+    if isinstance(email, str) and email.strip():
+        return f"auth.login|account:{email.strip().lower()}"
+    return None
+
+
+# ---------- Load shedding ----------
+def _queue_wait_ms() -> Optional[float]:
+    """
+    Time the request spent queued before reaching the app, from the proxy's
+    X-Request-Start ("t=<epoch>" in s, ms or us). Covers the listen backlog
+    and requests waiting for a free worker thread, which the app can't see.
+    """
+    raw = request.headers.get("X-Request-Start", "")
+    try:
+        ts = float(raw[2:] if raw.startswith("t=") else raw)
+    except ValueError:
+        return None
+    if ts > 1e14:
+        ts /= 1e6
+    elif ts > 1e11:
+        ts /= 1e3
+    return max(0.0, (time.time() - ts) * 1000)
+
+
+class Limiter:
+    """Per-process state: in-flight counter, bucket store, rejection counters."""
+
+    def __init__(self, app: Flask) -> None:
+        cfg = app.config
+        self.rules: Dict[str, Dict[str, Tuple[float, float]]] = cfg["RATE_LIMIT_RULES"]
+        self.max_inflight = cfg["SHED_MAX_INFLIGHT"]
+        self.max_queue_ms = cfg["SHED_MAX_QUEUE_MS"] if cfg["TRUSTED_PROXY_COUNT"] > 0 else 0
+        self.pool_saturation = cfg["SHED_POOL_SATURATION"]
+        if cfg["RATE_LIMIT_BACKEND"] == "sqlite":
+            self.store = SqliteBucketStore(cfg["RATE_LIMIT_SQLITE_PATH"])
+        else:
+            self.store = MemoryBucketStore()
+
+        self._lock = threading.Lock()
+        self.inflight = 0
+        self.last_queue_ms: Optional[float] = None
+        self.counters = {"limited_ip": 0, "limited_tenant": 0, "limited_account": 0,
+                         "shed_inflight": 0, "shed_queue": 0, "shed_pool": 0, "store_errors": 0}
+
+    def reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self.inflight = 0
+        self.last_queue_ms = None
+        self.counters = dict.fromkeys(self.counters, 0)
+        if hasattr(self.store, "reset_after_fork"):
+            self.store.reset_after_fork()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def _shed(self, inflight: int) -> Optional[str]:
+        if inflight >= self.max_inflight:
+            return "shed_inflight"
+        if self.max_queue_ms:
+            waited = _queue_wait_ms()
+            self.last_queue_ms = waited
+            if waited is not None and waited > self.max_queue_ms:
+                return "shed_queue"
+        usage = pool_status(db.engine)
+        if usage.get("capacity") and usage["checked_out"] >= self.pool_saturation * usage["capacity"]:
+            return "shed_pool"
+        return None
+
+    def before(self):
+        # Every request counts toward in-flight; only RATE_LIMIT_RULES endpoints are limited or shed
+        with self._lock:
+            self.inflight += 1
+            inflight = self.inflight
+        g._limiter_counted = True
+
+        rule = self.rules.get(request.endpoint)
+        if rule is None:
+            return None
+
+        shed = self._shed(inflight)
+        if shed:
+            self._count(shed)
+            resp = jsonify({"error": "Server busy, retry shortly"})
+            resp.status_code = 503
+            resp.headers["Retry-After"] = "1"
+            return resp
+
+        checks = [("ip", f"ip:{_client_ip()}")]
+        if "tenant" in rule:
+            tenant = _tenant()
+            if tenant:
+                checks.append(("tenant", tenant))
+        for kind, key in checks:
+            if kind not in rule:
+                continue
+            rate, burst = rule[kind]
+            try:
+                allowed, _, retry_after = self.store.take(f"{request.endpoint}|{key}", rate, burst)
+            except Exception:
+                # Fail open: a slow/locked shared store must not turn into 500s
+                logger.exception("rate limit store error")
+                self._count("store_errors")
+                continue
+            if not allowed:
+                self._count(f"limited_{kind}")
+                return self._too_many(retry_after)
+
+        # Per-account login limit: checked here, spent only by failed logins
+        if "failed_login" in rule:
+            account = _login_account()
+            if account:
+                rate, burst = rule["failed_login"]
+                try:
+                    tokens = self.store.peek(account, rate, burst)
+                except Exception:
+                    logger.exception("rate limit store error")
+                    self._count("store_errors")
+                    tokens = burst
+                if tokens < 1:
+                    self._count("limited_account")
+                    return self._too_many((1 - tokens) / rate)
+        return None
+
+    @staticmethod
+    def _too_many(retry_after: float):
+        resp = jsonify({"error": "Too many requests"})
+        resp.status_code = 429
+        resp.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return resp
+
+    def login_failed(self) -> None:
+        rule = self.rules.get("auth.login", {}).get("failed_login")
+        account = _login_account()
+        if not rule or not account:
+            return
+        try:
+            self.store.take(account, *rule)
+        except Exception:
+            logger.exception("rate limit store error")
+            self._count("store_errors")
+
+    def after(self, exc=None) -> None:
+        if g.pop("_limiter_counted", False):
+            with self._lock:
+                self.inflight -= 1
+
+    def metrics(self, limit: int = 20) -> Dict:
+        buckets, lowest = self.store.state(limit)
+        with self._lock:
+            counters = dict(self.counters)
+            inflight = self.inflight - 1  # minus the metrics request itself
+        return {
+            "inflight": inflight,
+            "max_inflight": self.max_inflight,
+            "last_queue_ms": None if self.last_queue_ms is None else round(self.last_queue_ms, 1),
+            "max_queue_ms": self.max_queue_ms or None,
+            "pool": pool_status(db.engine),
+            "rejections": counters,
+            "buckets": {"count": buckets, "lowest": lowest},
+        }
+
+
+def init_rate_limits(app: Flask) -> None:
+    """
+    Token-bucket limits per IP and per tenant on the endpoints in
+    RATE_LIMIT_RULES, plus load shedding. Runs before the view, so rejected
+    requests never reach PBKDF2 hashing or the database. With
+    TRUSTED_PROXY_COUNT > 0, the client IP is taken from that many
+    X-Forwarded-For hops (ProxyFix); otherwise from the socket.
+    """
+    proxies = app.config["TRUSTED_PROXY_COUNT"]
+    if proxies > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
+    if not app.config["RATE_LIMIT_ENABLED"]:
+        return
+    limiter = Limiter(app)
+    app.extensions["limiter"] = limiter
+    app.before_request(limiter.before)
+    app.teardown_request(limiter.after)
+
+
+def record_failed_login() -> None:
+    """Spend one token of the per-account login bucket (call on bad credentials)."""
+    limiter = current_app.extensions.get("limiter")
+    if limiter is not None:
+        limiter.login_failed()
+
+
+def limiter_metrics() -> Optional[Dict]:
+    limiter = current_app.extensions.get("limiter")
+    return limiter.metrics() if limiter else None
@@ -0,0 +1,82 @@
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    name: str
+    fn: Callable[[], object]
+    interval: float
+    next_run: float = field(default=0.0)
+
+
+class JobScheduler:
+    """
+    Minimal interval scheduler.
+    Jobs run one at a time inside the Flask app context, either on a daemon
+    thread (start) or in the foreground of a dedicated worker (run_forever).
+    Jobs must be safe to run concurrently from several processes.
+    """
+
+    def __init__(self, app, tick_seconds: float = 1.0, jitter: float = 0.1) -> None:
+        self.app = app
+        self.tick_seconds = tick_seconds
+        self.jitter = jitter
+        self.jobs: List[Job] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_job(self, name: str, fn: Callable[[], object], interval_seconds: float) -> None:
+        # Random first offset so workers started together don't sweep in lockstep
+        first = time.monotonic() + random.uniform(0, interval_seconds * self.jitter)
+        self.jobs.append(Job(name=name, fn=fn, interval=interval_seconds, next_run=first))
+
+    def _run(self, job: Job) -> None:
+        from extensions import db
+
+        started = time.monotonic()
+        with self.app.app_context():
+            try:
+                result = job.fn()
+                logger.info("job %s done in %.3fs: %s", job.name, time.monotonic() - started, result)
+            except Exception:
+                db.session.rollback()
+                logger.exception("job %s failed", job.name)
+            finally:
+                db.session.remove()
+
+    def run_pending(self) -> int:
+        ran = 0
+        for job in self.jobs:
+            if self._stop.is_set():
+                break
+            now = time.monotonic()
+            if now >= job.next_run:
+                self._run(job)
+                job.next_run = now + job.interval * (1 + random.uniform(-self.jitter, self.jitter))
+                ran += 1
+        return ran
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            self._stop.wait(self.tick_seconds)
+
+    def start(self) -> threading.Thread:
+        if self._thread and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="job-scheduler", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Type
+
+READ_SIZE = 64 * 1024
+
+
+@dataclass
+class StoredObject:
+    key: str          # sha256 of the whole content
+    size: int
+    new_chunks: int   # chunks that were not already in the store
+
+
+@dataclass
+class Segment:
+    path: str
+    offset: int
+    length: int
+
+
+class StorageBackend(ABC):
+    """
+    Content-addressed blob storage used by the document subsystem.
+    Objects are keyed by the sha256 of their content, so identical uploads
+    (from any company) resolve to the same object.
+    """
+
+    @classmethod
+    @abstractmethod
+    def from_config(cls, config) -> "StorageBackend":
+        ...
+
+    @abstractmethod
+    def put(self, stream: BinaryIO, max_bytes: Optional[int] = None) -> StoredObject:
+        """Store the stream; nothing is kept if it fails (e.g. exceeds max_bytes)."""
+
+    @abstractmethod
+    def size(self, key: str) -> Optional[int]:
+        ...
+
+    @abstractmethod
+    def read_range(self, key: str, start: int, stop: int) -> Iterator[bytes]:
+        ...
+
+    def local_segments(self, key: str, start: int, stop: int) -> Optional[List[Segment]]:
+        """Local files backing [start, stop), for zero-copy serving. None if not on local disk."""
+        return None
+
+
+class LocalChunkStore(StorageBackend):
+    """
+    Local filesystem backend.
+    Uploads are split into fixed-size chunks; each chunk is stored once under
+    its own sha256 (chunks/ab/cd/<hash>) and each object has a small manifest
+    (manifests/ab/<hash>) listing its chunks. Uploads stream straight to disk
+    (one READ_SIZE buffer). New chunks are written to a per-upload
+    staging directory and moved into chunks/ only once the whole upload has
+    been accepted, so a rejected upload leaves nothing behind. Every write
+    ends in os.replace, so concurrent uploads of the same content are safe.
+    """
+
+    def __init__(self, root: str, chunk_size: int = 25 * 1024 * 1024) -> None:
+        self.root = root
+        self.chunk_size = chunk_size
+        os.makedirs(os.path.join(root, "chunks"), exist_ok=True)
+        os.makedirs(os.path.join(root, "manifests"), exist_ok=True)
+        os.makedirs(os.path.join(root, "staging"), exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config) -> "LocalChunkStore":
+        return cls(config["DOCUMENT_STORAGE_PATH"], chunk_size=config["DOCUMENT_CHUNK_SIZE"])
+
+    # ---------- Paths ----------
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.root, "chunks", digest[:2], digest[2:4], digest)
+
+    def _manifest_path(self, key: str) -> str:
+        return os.path.join(self.root, "manifests", key[:2], key)
+
+    @staticmethod
+    def _write_atomic(path: str, data) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _stage_chunk(self, stream: BinaryIO, staging: str, whole, limit: Optional[int]) -> Tuple[str, int, str]:
+        """
+        Stream up to chunk_size bytes into a staged file. Returns (sha256, length, path).
+        Raises ValueError once more than `limit` bytes were read.
+        """
+        digest = hashlib.sha256()
+        n = 0
+        fd, path = tempfile.mkstemp(dir=staging, prefix=".chunk-")
+        with os.fdopen(fd, "wb") as fh:
+            while n < self.chunk_size:
+                data = stream.read(min(READ_SIZE, self.chunk_size - n))
+                if not data:
+                    break
+                n += len(data)
+                if limit is not None and n > limit:
+                    raise ValueError("File too large")
+                digest.update(data)
+                whole.update(data)
+                fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        return digest.hexdigest(), n, path
+
+    # ---------- StorageBackend ----------
+    def put(self, stream: BinaryIO, max_bytes: Optional[int] = None) -> StoredObject:
+        whole = hashlib.sha256()
+        chunks: List[Tuple[str, int]] = []
+        staged: Dict[str, str] = {}  # digest -> staged path, for chunks not yet in the store
+        size = 0
+
+        staging = tempfile.mkdtemp(dir=os.path.join(self.root, "staging"))
+        try:
+            while True:
+                limit = None if max_bytes is None else max_bytes - size
+                digest, n, path = self._stage_chunk(stream, staging, whole, limit)
+                if n == 0:
+                    break
+                size += n
+                if digest in staged or os.path.exists(self._chunk_path(digest)):
+                    os.unlink(path)
+                else:
+                    staged[digest] = path
+                chunks.append((digest, n))
+                if n < self.chunk_size:
+                    break
+
+            if size == 0:
+                raise ValueError("Empty upload")
+
+            # Accepted: publish staged chunks, then the manifest that references them
+            for digest, path in staged.items():
+                target = self._chunk_path(digest)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(path, target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        key = whole.hexdigest()
+        manifest = self._manifest_path(key)
+        if not os.path.exists(manifest):
+            self._write_atomic(manifest, json.dumps({"size": size, "chunks": chunks}).encode())
+        return StoredObject(key=key, size=size, new_chunks=len(staged))
+
+    def _manifest(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._manifest_path(key), "rb") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+
+    def size(self, key: str) -> Optional[int]:
+        manifest = self._manifest(key)
+        return manifest["size"] if manifest else None
+
+    def local_segments(self, key: str, start: int, stop: int) -> Optional[List[Segment]]:
+        manifest = self._manifest(key)
+        if manifest is None:
+            return None
+        segments: List[Segment] = []
+        pos = 0
+        for digest, length in manifest["chunks"]:
+            lo, hi = max(start, pos), min(stop, pos + length)
+            if lo < hi:
+                segments.append(Segment(self._chunk_path(digest), lo - pos, hi - lo))
+            pos += length
+            if pos >= stop:
+                break
+        return segments
+
+    def read_range(self, key: str, start: int, stop: int) -> Iterator[bytes]:
+        for seg in self.local_segments(key, start, stop) or []:
+            with open(seg.path, "rb") as fh:
+                fh.seek(seg.offset)
+                remaining = seg.length
+                while remaining:
+                    data = fh.read(min(READ_SIZE, remaining))
+                    if not data:
+                        raise IOError(f"Chunk truncated: {seg.path}")
+                    remaining -= len(data)
+                    yield data
+
+
+BACKENDS: Dict[str, Type[StorageBackend]] = {
+    "local": LocalChunkStore,
+}
+
+
+def storage_from_config(config) -> StorageBackend:
+    name = config["DOCUMENT_STORAGE_BACKEND"]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown document storage backend: {name}")
+    return BACKENDS[name].from_config(config)
@@ -0,0 +1,58 @@
+# worker.py
+"""
+Housekeeping worker. Run as a separate process (`python worker.py`), or set
+JOBS_INPROCESS=1 to run the same jobs on a thread inside the API process.
+Several workers may run at once; sweeps claim rows with SKIP LOCKED. The
+same worker executes queued company solver runs (CPU-heavy: prefer the
+separate process for those).
+"""
+import logging
+
+from utils.scheduler import JobScheduler
+from services.housekeeping_service import HousekeepingService
+from services.forecast_service import ForecastService
+from services.audit_service import AuditService
+from services.company_solver_service import CompanySolverService, SolverRunService
+
+
+def build_scheduler(app) -> JobScheduler:
+    cfg = app.config
+    interval = cfg["HOUSEKEEPING_INTERVAL_SECONDS"]
+    hk = HousekeepingService(batch_size=cfg["HOUSEKEEPING_BATCH_SIZE"])
+
+    scheduler = JobScheduler(app)
+    scheduler.add_job("expire_invites", hk.expire_invites, interval)
+    scheduler.add_job("purge_stale_drafts",
+                      lambda: hk.purge_stale_drafts(cfg["DRAFT_RETENTION_DAYS"]),
+                      interval)
+    scheduler.add_job("purge_idempotency_records", hk.purge_idempotency_records, interval)
+    scheduler.add_job("ensure_audit_partitions",
+                      lambda: AuditService.ensure_partitions(cfg["AUDIT_PARTITION_MONTHS_AHEAD"]),
+                      interval)
+
+    # Rollups
+    fc = ForecastService(batch_locations=cfg["DEMAND_BATCH_LOCATIONS"])
+    scheduler.add_job("refresh_demand_forecasts",
+                      lambda: fc.refresh_stale(cfg["DEMAND_DEFAULT_WEEKS"]),
+                      interval)
+
+    # Company solver runs (queued by POST /schedules/company/<id>/solve, or nightly)
+    runs = SolverRunService(
+        CompanySolverService(workers=cfg["SOLVER_WORKERS"] or None,
+                             max_minutes=cfg["SOLVER_MAX_WEEKLY_MINUTES"],
+                             mp_context=cfg["SOLVER_MP_CONTEXT"]),
+        timeout_seconds=cfg["SOLVER_RUN_TIMEOUT_SECONDS"],
+    )
+    scheduler.add_job("run_solver_queue", runs.run_pending, cfg["SOLVER_POLL_SECONDS"])
+    if cfg["SOLVER_NIGHTLY_HOUR"] >= 0:
+        scheduler.add_job("enqueue_nightly_solver_runs",
+                          lambda: runs.enqueue_nightly(cfg["SOLVER_NIGHTLY_HOUR"]),
+                          interval)
+    return scheduler
+
+
+if __name__ == "__main__":
+    from app import create_app
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    build_scheduler(create_app()).run_forever()